@@ -0,0 +1,102 @@
+"""
+Formats 10k synthetic affiliates with the Affiliates view columns, both with the
+original cell by cell code (field path split per cell, uncached formatters) and with
+the column by column pipeline used by DataGrid.
+
+    python benchmarks/format_rows.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fico.utils import format_at, format_status, format_timestamp
+from fico.views.accounts import Accounts
+from fico.widgets.datagrid import DataGridColumn, format_rows
+
+STATUSES = ("active", "disabled", "deleted")
+
+
+def make_accounts(count: int) -> list[dict[str, Any]]:
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    users = [{"id": f"FUSR-{i:04}-0000", "name": f"User {i}", "type": "user"} for i in range(20)]
+
+    def event() -> dict[str, Any]:
+        at = start + timedelta(minutes=random.randrange(count // 2))
+        return {"at": at.isoformat(), "by": random.choice(users)}
+
+    return [
+        {
+            "id": f"FACC-{i:04}-{i:04}",
+            "name": f"Affiliate {i}",
+            "external_id": f"EXT-{i}",
+            "status": random.choice(STATUSES),
+            "events": {"created": event(), "updated": event()},
+        }
+        for i in range(count)
+    ]
+
+
+def original_format_at(event: dict[str, Any]) -> str:
+    if "at" not in event:
+        return "-"
+    date = datetime.fromisoformat(event["at"])
+    return date.strftime("%d/%m/%Y %H:%M:%S")
+
+
+ORIGINAL_FORMATTERS = {
+    format_at: original_format_at,
+    format_status: format_status.__wrapped__,
+}
+
+
+def original_get_field(column: DataGridColumn, object: dict[str, Any]) -> str:
+    parts = column.field.split(".")
+    obj: dict | str | None = object
+    for part in parts:
+        if not obj or not isinstance(obj, dict):
+            return "-"
+        obj = obj.get(part)
+
+    if not obj:
+        return "-"
+    formatter = ORIGINAL_FORMATTERS.get(column.formatter, column.formatter)
+    return str(obj if not formatter else formatter(obj))
+
+
+def format_cells(columns: list[DataGridColumn], objects: list[dict[str, Any]]) -> list[tuple]:
+    return [tuple(original_get_field(column, obj) for column in columns) for obj in objects]
+
+
+def measure(formatter, columns, objects, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        format_timestamp.cache_clear()
+        format_status.cache_clear()
+        started_at = time.perf_counter()
+        formatter(columns, objects)
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    columns = Accounts(None).get_columns()  # type: ignore
+    objects = make_accounts(args.rows)
+    assert format_cells(columns, objects) == format_rows(columns, objects)
+
+    print(f"rows: {args.rows}, columns: {len(columns)}")
+    print(f"cell by cell:     {measure(format_cells, columns, objects, args.repeat):8.1f}ms")
+    print(f"column by column: {measure(format_rows, columns, objects, args.repeat):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
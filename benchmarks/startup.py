@@ -0,0 +1,112 @@
+"""
+Measures the cold start of the app in fresh interpreters: the cumulative import time
+of `fico.app` as reported by `python -X importtime`, and the time from the process
+start to the first frame of the login dialog. Exits with status 1 if the median of
+any of them exceeds its budget.
+
+    python benchmarks/startup.py --runs 5 --import-budget 500 --frame-budget 1000
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+HEAVY_MODULES = ("pycountry", "tree_sitter_rql", "markdown_it")
+
+FIRST_FRAME = """
+import asyncio
+import time
+
+started_at = time.perf_counter()
+
+from fico.app import Fico
+
+
+async def main():
+    app = Fico()
+    async with app.run_test(headless=True) as pilot:
+        await pilot.pause()
+        print(time.perf_counter() - started_at)
+
+
+asyncio.run(main())
+"""
+
+
+def measure_imports(env: dict[str, str]) -> tuple[float, dict[str, float]]:
+    """Returns the cumulative import time of `fico.app` and of the top level fico modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fico.app"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, _, module = match.groups()
+        if module == "fico.app":
+            total = int(cumulative) / 1000
+        if module.startswith("fico.") or module.split(".")[0] in HEAVY_MODULES:
+            modules[module] = int(cumulative) / 1000
+    return total, modules
+
+
+def measure_first_frame(env: dict[str, str]) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_FRAME],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=500, help="in milliseconds")
+    parser.add_argument("--frame-budget", type=float, default=1000, help="in milliseconds")
+    parser.add_argument("--top", type=int, default=10, help="slowest fico modules to show")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        # Start without a saved config, the app shows the login dialog.
+        env = {**os.environ, "HOME": home}
+        imports = []
+        frames = []
+        modules: dict[str, float] = {}
+        for _ in range(args.runs):
+            total, modules = measure_imports(env)
+            imports.append(total)
+            frames.append(measure_first_frame(env))
+
+    import_time = statistics.median(imports)
+    frame_time = statistics.median(frames)
+    print(f"import fico.app: median {import_time:.0f}ms (budget {args.import_budget:.0f}ms)")
+    print(f"first frame:     median {frame_time:.0f}ms (budget {args.frame_budget:.0f}ms)")
+    print("slowest modules of the last run:")
+    for module, elapsed in sorted(modules.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {elapsed:8.1f}ms  {module}")
+
+    loaded = [module for module in HEAVY_MODULES if module in modules]
+    if loaded:
+        print(f"modules that should be loaded lazily: {', '.join(loaded)}")
+    if import_time > args.import_budget or frame_time > args.frame_budget or loaded:
+        print("over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
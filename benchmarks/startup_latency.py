@@ -0,0 +1,117 @@
+"""
+Measures the time between the app start and the first rows shown in the Affiliates
+view, against a local stub of the FinOps for Cloud API that answers every request
+after a fixed latency.
+
+    python benchmarks/startup_latency.py --latency 0.2 --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SPEC = {"paths": {"/accounts": {"get": {"description": "RQL help"}}}}
+ACCOUNTS = {
+    "total": 10,
+    "limit": 10,
+    "offset": 0,
+    "items": [
+        {"id": f"FACC-{i:04}", "name": f"Affiliate {i}", "status": "active"} for i in range(10)
+    ],
+}
+EMPTY = {"total": 0, "limit": 10, "offset": 0, "items": []}
+
+
+def make_handler(latency: float) -> type[BaseHTTPRequestHandler]:
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            path = self.path.split("?")[0].removeprefix("/ops/v1")
+            if path == "/openapi.json":
+                body = SPEC
+            elif path.startswith("/users/"):
+                body = {"id": path.rsplit("/", 1)[-1]}
+            elif path == "/accounts":
+                body = ACCOUNTS
+            else:
+                body = EMPTY
+            content = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return StubHandler
+
+
+def write_config(home: Path, url: str) -> None:
+    config_path = home / ".fico"
+    config_path.mkdir(parents=True, exist_ok=True)
+    config = {
+        "url": url,
+        "credentials": {"FACC-0000": "access_token", "refresh_token": "refresh_token"},
+        "user": {"id": "FUSR-0000", "name": "Benchmark"},
+        "last_used_account": {"id": "FACC-0000", "name": "Operations", "type": "operations"},
+    }
+    (config_path / "config.json").write_text(json.dumps(config))
+
+
+async def time_to_first_rows(timeout: float) -> float:
+    from textual.widgets import DataTable
+
+    from fico.app import Fico
+    from fico.views.accounts import Accounts
+
+    app = Fico()
+    started_at = time.perf_counter()
+    async with app.run_test(headless=True) as pilot:
+        while time.perf_counter() - started_at < timeout:
+            views = app.screen.query(Accounts)
+            if views and views.first().query_one(DataTable).row_count:
+                return time.perf_counter() - started_at
+            await pilot.pause(0.005)
+    raise TimeoutError("No rows shown")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub latency in seconds")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--cold", action="store_true", help="remove the saved OpenAPI spec before every run"
+    )
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/ops/v1"
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        timings = []
+        for _ in range(args.runs):
+            write_config(Path(home), url)
+            if args.cold:
+                for path in (Path(home) / ".fico" / "specs").glob("*"):
+                    path.unlink()
+            timings.append(asyncio.run(time_to_first_rows(timeout=30)))
+
+    server.shutdown()
+    print(f"latency: {args.latency * 1000:.0f}ms, runs: {args.runs}")
+    print(f"time to first rows: median {statistics.median(timings) * 1000:.0f}ms, ", end="")
+    print(f"min {min(timings) * 1000:.0f}ms, max {max(timings) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,68 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import functools
+import json
 import logging
+import time
 from asyncio import Semaphore
-from collections.abc import AsyncGenerator
+from collections import Counter
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine
+from contextlib import aclosing
 from typing import Any
 
-from httpx import AsyncClient, Auth, HTTPError, HTTPStatusError, Request, Response, codes
+from httpx import (
+    AsyncClient,
+    Auth,
+    HTTPError,
+    HTTPStatusError,
+    Request,
+    Response,
+    TransportError,
+    codes,
+)
 from textual import log
 
+from fico.cache import EntityStore, TTLCache
+from fico.concurrency import AdaptiveConcurrency
 from fico.config import Config
+from fico.constants import DEFAULT_RATE_LIMIT, RATE_LIMITS
+from fico.httpcache import CachingTransport
+from fico.metrics import Metrics
+from fico.ratelimit import Priority, TokenBucket, request_priority
+from fico.retry import RetryBudget, RetryPolicy
+from fico.specs import APISpecs
 
 logger = logging.getLogger(__name__)
 
 CONCURRENCY = 5
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
 ITEMS_PER_PAGE = 100
+MIN_ITEMS_PER_PAGE = 50
+MAX_ITEMS_PER_PAGE = 200
+READ_AHEAD_PAGES = MAX_CONCURRENCY * 2
+THROTTLING_STATUSES = (codes.TOO_MANY_REQUESTS, codes.SERVICE_UNAVAILABLE)
+HTTP_CACHE_MAX_SIZE = 50 * 1024 * 1024
+OBJECT_CACHE_SIZE = 1000
+OBJECT_CACHE_TTL = 60
+TOKEN_REFRESH_MARGIN = 60
+TOKEN_EXPIRY_LEEWAY = 10
 
 
 class APIError(Exception):
-    def __init__(self, message: str):
+    def __init__(self, message: str, status_code: int | None = None):
         self.message = message
+        self.status_code = status_code
 
     @classmethod
     def from_exception(cls, error: HTTPError):
         if isinstance(error, HTTPStatusError):
             status = error.response.status_code
             if status == codes.BAD_REQUEST:
-                return cls(error.response.json()["detail"])
+                return cls(error.response.json()["detail"], status_code=status)
+            return cls(str(error), status_code=status)
 
         return cls(str(error))
 
@@ -46,28 +81,113 @@ def api_error_formatter():
     return decorator
 
 
+def get_token_expiration(token: str | None) -> float | None:
+    """Returns the `exp` claim of a JWT, the signature is not verified."""
+    try:
+        payload = token.split(".")[1]  # type: ignore
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def is_token_expiring(token: str | None) -> bool:
+    expires_at = get_token_expiration(token)
+    return expires_at is not None and expires_at - time.time() <= TOKEN_EXPIRY_LEEWAY
+
+
 class FFCOpsAuth(Auth):
     requires_response_body = True
 
     def __init__(self, refresh_url: str, client: FFCOpsClient):
         self.refresh_url = refresh_url
         self.client = client
+        self.refreshing: asyncio.Task | None = None
+        self.refresh_timer: asyncio.TimerHandle | None = None
+        self.scheduled_token: str | None = None
+        self.background_refresh: asyncio.Task | None = None
 
     async def async_auth_flow(self, request: Request) -> AsyncGenerator[Request, Response]:
-        request.headers["Authorization"] = f"Bearer {self.client.get_access_token()}"
+        access_token = self.client.get_access_token()
+        if is_token_expiring(access_token):
+            log("Access token is about to expire, refresh it before sending the request")
+            await self.refresh_tokens(access_token)
+            access_token = self.client.get_access_token()
+        self.schedule_refresh(access_token)
+        request.headers["Authorization"] = f"Bearer {access_token}"
         response = yield request
 
         if response.status_code == 401:
             log("Access token has expired, try to refresh it")
-            refresh_request = self.build_refresh_request()
-            refresh_response = yield refresh_request
-            await refresh_response.aread()
-            self.update_tokens(refresh_response)
+            await self.refresh_tokens(access_token)
 
             # Retry the original request with the new token
             request.headers["Authorization"] = f"Bearer {self.client.get_access_token()}"
             yield request
 
+    async def refresh_tokens(self, expired_token: str | None) -> None:
+        """
+        Refreshes the tokens once for all the concurrent requests that have been
+        rejected with `expired_token`, the others wait for the refresh in progress.
+        """
+        if self.client.get_access_token() != expired_token:
+            return
+        if not self.refreshing:
+            self.refreshing = asyncio.create_task(self.send_refresh_request())
+        await asyncio.shield(self.refreshing)
+
+    async def send_refresh_request(self) -> None:
+        try:
+            response = await self.client.client.send(
+                self.build_refresh_request(),
+                auth=None,  # type: ignore
+            )
+            self.update_tokens(response)
+        finally:
+            if self.refreshing is asyncio.current_task():
+                self.refreshing = None
+        self.schedule_refresh(self.client.get_access_token())
+
+    def schedule_refresh(self, access_token: str | None) -> None:
+        """Schedules a background refresh shortly before `access_token` expires."""
+        if access_token == self.scheduled_token:
+            return
+        self.cancel_timer()
+        self.scheduled_token = access_token
+        expires_at = get_token_expiration(access_token)
+        if expires_at is None:
+            return
+        remaining = expires_at - time.time()
+        delay = max(0, remaining - min(TOKEN_REFRESH_MARGIN, remaining / 2))
+        self.refresh_timer = asyncio.get_running_loop().call_later(
+            delay, self.refresh_in_background, access_token
+        )
+
+    def refresh_in_background(self, access_token: str | None) -> None:
+        async def refresh():
+            try:
+                await self.refresh_tokens(access_token)
+            except HTTPError as e:
+                logger.warning(f"Background token refresh failed: {e}")
+
+        self.refresh_timer = None
+        self.background_refresh = asyncio.create_task(refresh())
+
+    def cancel_timer(self) -> None:
+        if self.refresh_timer:
+            self.refresh_timer.cancel()
+            self.refresh_timer = None
+        self.scheduled_token = None
+
+    def cancel_refresh(self) -> None:
+        """Cancels the scheduled and running refreshes when the session ends."""
+        self.cancel_timer()
+        for task in (self.background_refresh, self.refreshing):
+            if task:
+                task.cancel()
+        self.background_refresh = None
+        self.refreshing = None
+
     def build_refresh_request(self) -> Request:
         """Builds the token refresh request."""
         return Request(
@@ -90,17 +210,133 @@ class FFCOpsClient:
     def __init__(self) -> None:
         self.config = Config()
         self.limit = 10
-        self.specs: dict = {}
+        self.specs: APISpecs | None = None
+        self.specs_refresh: asyncio.Task | None = None
+        self.metrics = Metrics()
+        self.concurrency = AdaptiveConcurrency(
+            self.metrics,
+            limit=CONCURRENCY,
+            min_limit=MIN_CONCURRENCY,
+            max_limit=MAX_CONCURRENCY,
+            page_size=ITEMS_PER_PAGE,
+            min_page_size=MIN_ITEMS_PER_PAGE,
+            max_page_size=MAX_ITEMS_PER_PAGE,
+        )
+        self.inflight: dict[tuple[str, str, str], asyncio.Task] = {}
+        self.waiters: Counter[tuple[str, str, str]] = Counter()
+        self.entities = EntityStore()
+        self.objects = TTLCache(OBJECT_CACHE_SIZE, OBJECT_CACHE_TTL)
+        self.retry_policy = RetryPolicy()
+        self.retry_budget = RetryBudget()
+        self.auth: FFCOpsAuth | None = None
         if not self.config.is_configured():
             return
-        self.client = AsyncClient(
-            base_url=self.config.get_url(),
-            auth=FFCOpsAuth(f"{self.config.get_url()}/auth/tokens", self),
+        self.client = self.build_client(self.config.get_url())
+
+    def build_client(self, base_url: str) -> AsyncClient:
+        if self.auth:
+            self.auth.cancel_refresh()
+        self.auth = FFCOpsAuth(f"{base_url}/auth/tokens", self)
+        self.specs = APISpecs(self.config.get_cache_path("specs", base_url).with_suffix(".json"))
+        self.rate_limiter = TokenBucket(
+            self.config.get_rate_limit(base_url) or RATE_LIMITS.get(base_url, DEFAULT_RATE_LIMIT),
+            metrics=self.metrics,
         )
+        transport = None
+        if self.config.is_http_cache_enabled():
+            transport = CachingTransport(
+                self.config.get_cache_path("http-cache", base_url),
+                scope=lambda: self.get_current_account()["id"],
+                max_size=HTTP_CACHE_MAX_SIZE,
+            )
+        return AsyncClient(base_url=base_url, auth=self.auth, transport=transport)
 
     def get_url(self) -> str:
         return self.config.get_url()
 
+    async def request(
+        self, method: str, url: str, idempotent: bool = False, **kwargs: Any
+    ) -> Response:
+        """Sends a request when the rate limiter allows it, retrying it if it is idempotent."""
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            response = None
+            await self.rate_limiter.acquire()
+            sent_at = time.monotonic()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except TransportError:
+                if not self.can_retry(idempotent, attempt):
+                    raise
+            else:
+                if response.status_code in THROTTLING_STATUSES:
+                    self.concurrency.record_throttled(response.status_code, sent_at)
+                elif request_priority.get() == Priority.BULK:
+                    # Only the round trip, without the rate limiter and the retry waits.
+                    self.concurrency.record_success(time.monotonic() - sent_at)
+                if response.status_code not in self.retry_policy.statuses or not self.can_retry(
+                    idempotent, attempt
+                ):
+                    return response
+
+            delay = self.retry_policy.get_delay(attempt, response)
+            logger.info(f"Retry {method} {url} in {delay:.2f}s (attempt {attempt + 1})")
+            self.metrics.incr("retry.attempts")
+            self.metrics.incr("retry.delay", delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def coalesce(
+        self, method: str, url: str, fetch: Callable[[], Coroutine[Any, Any, Any]]
+    ) -> Any:
+        """
+        Runs `fetch` once for all the concurrent callers of the same method and url on
+        behalf of the current account, and shares the decoded result between them.
+        """
+        key = (method, url, self.get_current_account()["id"])
+        task = self.inflight.get(key)
+        if task:
+            self.metrics.incr("coalesced")
+            # The shared fetch runs at the priority of its first caller, raise it to ours.
+            self.rate_limiter.escalate(task, request_priority.get())
+        else:
+            task = asyncio.create_task(fetch())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.forget_inflight(key, task))
+
+        self.waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self.waiters[key] == 1 and not task.done():
+                # Nobody else waits for the result, cancel the request.
+                self.metrics.incr("coalesce.cancelled")
+                self.forget_inflight(key, task)
+                task.cancel()
+            raise
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+
+    def forget_inflight(self, key: tuple[str, str, str], task: asyncio.Task) -> None:
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+
+    async def get_json(self, url: str) -> Any:
+        response = await self.request("GET", url, idempotent=True)
+        response.raise_for_status()
+        return response.json()
+
+    def can_retry(self, idempotent: bool, attempt: int) -> bool:
+        if not idempotent or attempt + 1 >= self.retry_policy.max_attempts:
+            return False
+        if not self.retry_budget.withdraw():
+            self.metrics.incr("retry.budget_exhausted")
+            return False
+        return True
+
     def get_current_account(self) -> dict[str, Any]:
         return self.config.get_last_used_account()
 
@@ -117,25 +353,44 @@ class FFCOpsClient:
         self.config.set_credentials(access_token, refresh_token)
 
     async def logout(self) -> None:
+        self.objects.clear()
+        self.entities.clear()
+        if self.auth:
+            self.auth.cancel_refresh()
         await self.client.aclose()
         self.config.delete()
 
     async def fetch_specs(self) -> None:
-        response = await self.client.get("/openapi.json", auth=None)
-        response.raise_for_status()
-        self.specs = response.json()
+        """
+        Loads the OpenAPI spec index saved for the API and revalidates it in background,
+        the spec is downloaded before returning only if there is no saved index.
+        """
+        if self.specs is None:
+            return
+        if not self.specs.load():
+            await self.specs.fetch(self.client)
+            return
+        self.specs_refresh = asyncio.create_task(self.refresh_specs(self.specs))
+
+    async def refresh_specs(self, specs: APISpecs) -> None:
+        try:
+            await specs.fetch(self.client)
+        except (HTTPError, AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Cannot refresh the OpenAPI spec: {e}")
 
     async def can_connect(self) -> bool:
+        """
+        Checks that the saved credentials are still valid, while loading the OpenAPI
+        spec index at the same time.
+        """
         if not self.config.is_configured():
             return False
         user = self.config.get_user()
-        response = await self.client.get(
-            f"/users/{user['id']}",
+        response, _ = await asyncio.gather(
+            self.request("GET", f"/users/{user['id']}", idempotent=True),
+            self.fetch_specs(),
         )
-        if response.status_code == 200:
-            await self.fetch_specs()
-            return True
-        return False
+        return response.status_code == 200
 
     async def change_current_account(self, account: dict[str, Any]) -> None:
         self.config.set_last_used_account(account)
@@ -148,10 +403,7 @@ class FFCOpsClient:
         self.set_credentials(data["access_token"], data["refresh_token"])
 
     async def login(self, base_url: str, email: str, password: str) -> None:
-        self.client = AsyncClient(
-            base_url=base_url,
-            auth=FFCOpsAuth(f"{base_url}/auth/tokens", self),
-        )
+        self.client = self.build_client(base_url)
         await self.fetch_specs()
         response = await self.client.post(
             "/auth/tokens",
@@ -167,10 +419,7 @@ class FFCOpsClient:
 
     @api_error_formatter()
     async def accept_invitation(self, base_url: str, user: str, token: str, password: str) -> None:
-        self.client = AsyncClient(
-            base_url=base_url,
-            auth=FFCOpsAuth(f"{base_url}/auth/tokens", self),
-        )
+        self.client = self.build_client(base_url)
         await self.fetch_specs()
         response = await self.client.post(
             f"/users/{user}/accept-invitation",
@@ -183,8 +432,10 @@ class FFCOpsClient:
         user = self.config.get_user()
         return await self.get_all_objects(f"users/{user['id']}/accounts")
 
-    def get_rql_help(self, collection: str) -> str:
-        return self.specs["paths"][f"/{collection}"]["get"]["description"]
+    def get_rql_help(self, collection: str) -> str | None:
+        if self.specs is None:
+            return None
+        return self.specs.get_rql_help(collection)
 
     @api_error_formatter()
     async def list_objects(
@@ -193,41 +444,54 @@ class FFCOpsClient:
         qs = f"limit={limit}&offset={offset}"
         if rql:
             qs = f"{rql}&{qs}"
-        response = await self.client.get(
-            f"/{collection}?{qs}",
-        )
-        response.raise_for_status()
-        return response.json()
+        url = f"/{collection}?{qs}"
+        return await self.coalesce("GET", url, lambda: self.fetch_page(collection, url))
+
+    async def fetch_page(self, collection: str, url: str) -> dict[str, Any]:
+        page = await self.get_json(url)
+        page["items"] = [self.entities.put(collection, item) for item in page["items"]]
+        for item in page["items"]:
+            if "id" in item:
+                self.objects.set((collection, item["id"]), item)
+        return page
 
     @api_error_formatter()
     async def create_object(self, collection: str, payload: dict[str, Any]) -> dict[str, Any]:
-        response = await self.client.post(
-            f"/{collection}",
-            json=payload,
-        )
+        response = await self.request("POST", f"/{collection}", json=payload)
         response.raise_for_status()
-        return response.json()
+        obj = self.entities.put(collection, response.json())
+        if "id" in obj:
+            self.objects.set((collection, obj["id"]), obj)
+        return obj
 
     @api_error_formatter()
     async def get_object(self, collection: str, id: str) -> dict[str, Any]:
-        response = await self.client.get(f"/{collection}/{id}")
-        response.raise_for_status()
-        return response.json()
+        obj = self.objects.get((collection, id))
+        if obj is not None:
+            self.metrics.incr("object_cache.hits")
+            return obj
+        self.metrics.incr("object_cache.misses")
+        url = f"/{collection}/{id}"
+        obj = await self.coalesce("GET", url, lambda: self.get_json(url))
+        obj = self.entities.put(collection, obj)
+        self.objects.set((collection, id), obj)
+        return obj
 
     @api_error_formatter()
     async def update_object(
         self, collection: str, id: str, payload: dict[str, Any]
     ) -> dict[str, Any]:
-        response = await self.client.put(
-            f"/{collection}/{id}",
-            json=payload,
-        )
+        self.objects.pop((collection, id))
+        response = await self.request("PUT", f"/{collection}/{id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        obj = self.entities.put(collection, response.json())
+        self.objects.set((collection, id), obj)
+        return obj
 
     @api_error_formatter()
     async def delete_object(self, collection: str, id: str) -> None:
-        response = await self.client.delete(f"/{collection}/{id}")
+        self.objects.pop((collection, id))
+        response = await self.request("DELETE", f"/{collection}/{id}")
         response.raise_for_status()
 
     @api_error_formatter()
@@ -238,21 +502,38 @@ class FFCOpsClient:
         id: str,
         action: str,
         payload: dict[str, Any] | None = None,
+        safe: bool = False,
     ) -> dict[str, Any] | None:
-        response = await self.client.request(
+        response = await self.request(
             method.upper(),
             f"/{collection}/{id}/{action}",
+            idempotent=safe,
             json=payload,
         )
+        self.objects.pop((collection, id))
         response.raise_for_status()
-        return response.json()
+        obj = response.json()
+        if isinstance(obj, dict) and obj.get("id") == id:
+            obj = self.entities.put(collection, obj)
+            self.objects.set((collection, id), obj)
+        return obj
 
     @api_error_formatter()
-    async def switch_account(self, account_id: str) -> None:
+    async def switch_account(self, account: dict[str, Any]) -> None:
+        access_token = self.config.get_account_access_token(account["id"])
+        self.objects.clear()
+        self.entities.clear()
+        if self.auth:
+            self.auth.cancel_refresh()
+        if access_token and not is_token_expiring(access_token):
+            log(f"Reuse the cached access token for account {account['id']}")
+            self.config.set_last_used_account(account)
+            return
+
         response = await self.client.post(
             "/auth/tokens",
             json={
-                "account": {"id": account_id},
+                "account": {"id": account["id"]},
                 "refresh_token": self.config.get_refresh_token(),
             },
             auth=None,  # type: ignore
@@ -274,67 +555,140 @@ class FFCOpsClient:
         )
 
     async def get_employee(self, email):
-        response = await self.client.get(
-            f"/employees/{email}",
-        )
+        response = await self.request("GET", f"/employees/{email}", idempotent=True)
         if response.status_code == 404:
             return
-        return response.json()
+        return self.entities.put("employees", response.json())
 
     async def get_organization_employees(self, id) -> dict[str, Any] | None:
-        response = await self.client.get(
-            f"/organizations/{id}/employees",
-        )
+        response = await self.request("GET", f"/organizations/{id}/employees", idempotent=True)
         if response.status_code == 404:
             return None
 
-        items = response.json()
+        collection = f"organizations/{id}/employees"
+        items = [self.entities.put(collection, item) for item in response.json()]
         return {
             "total": len(items),
             "items": items,
         }
 
     async def get_organization_datasources(self, id) -> dict[str, Any] | None:
-        response = await self.client.get(
-            f"/organizations/{id}/datasources",
-        )
+        response = await self.request("GET", f"/organizations/{id}/datasources", idempotent=True)
         if response.status_code == 404:
             return None
 
-        items = response.json()
+        collection = f"organizations/{id}/datasources"
+        items = [self.entities.put(collection, item) for item in response.json()]
         return {
             "total": len(items),
             "items": items,
         }
 
     async def create_employee(self, payload):
-        response = await self.client.post(
-            "/employees",
-            json=payload,
-        )
+        response = await self.request("POST", "/employees", json=payload)
         response.raise_for_status()
-        return response.json()
+        return self.entities.put("employees", response.json())
+
+    async def iter_all_objects(
+        self, collection: str, rql: str | None = None, ordered: bool = True
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yields all the objects of a collection as their pages arrive."""
+        async with aclosing(self.iter_all_pages(collection, rql, ordered)) as pages:
+            async for page in pages:
+                for item in page:
+                    yield item
+
+    async def iter_all_pages(
+        self, collection: str, rql: str | None = None, ordered: bool = True
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Yields the objects of all the pages of a collection, page by page as they arrive."""
+        # Page size the API applies to this collection, lowered when it serves short pages.
+        page_cap = self.concurrency.max_page_size
+
+        def cap_page_size(limit: int, page: dict[str, Any], remaining: int) -> None:
+            nonlocal page_cap
+            served = page.get("limit", len(page["items"]))
+            if 0 < served < min(limit, remaining):
+                page_cap = min(page_cap, served)
+
+        response = await self.list_objects(collection, self.concurrency.page_size, 0, rql)
+        total = response["total"]
+        first_limit = len(response["items"])
+        cap_page_size(self.concurrency.page_size, response, total)
+        if total <= first_limit or not first_limit:
+            yield response["items"]
+            return
+
+        remaining = total - first_limit
+        workers = min(self.concurrency.max_limit, -(-remaining // self.concurrency.min_page_size))
+        offsets: asyncio.Queue[tuple[int, int] | None] = asyncio.Queue(maxsize=workers or 1)
+        pages: asyncio.Queue[tuple[int, int, list[dict[str, Any]]] | Exception | None] = (
+            asyncio.Queue()
+        )
+        window = Semaphore(READ_AHEAD_PAGES)
+
+        async def produce():
+            offset = first_limit
+            while offset < total:
+                await window.acquire()
+                limit = min(self.concurrency.page_size, page_cap)
+                await offsets.put((offset, limit))
+                offset += limit
+            for _ in range(workers):
+                await offsets.put(None)
+
+        async def fetch_pages():
+            request_priority.set(Priority.BULK)
+            while (page := await offsets.get()) is not None:
+                offset, limit = page
+                items: list[dict[str, Any]] = []
+                expected = min(limit, total - offset)
+                while len(items) < expected:
+                    async with self.concurrency.slot():
+                        response = await self.list_objects(
+                            collection, limit - len(items), offset + len(items), rql
+                        )
+                    cap_page_size(limit - len(items), response, expected - len(items))
+                    if not response["items"]:
+                        break
+                    items.extend(response["items"])
+                pages.put_nowait((offset, limit, items))
+
+        async def run():
+            try:
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(produce())
+                    for _ in range(workers):
+                        group.create_task(fetch_pages())
+            except ExceptionGroup as e:
+                pages.put_nowait(e.exceptions[0])
+            else:
+                pages.put_nowait(None)
+
+        runner = asyncio.create_task(run())
+        buffered: dict[int, tuple[int, list[dict[str, Any]]]] = {}
+        next_offset = first_limit
+        try:
+            yield response["items"]
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                offset, limit, items = page
+                buffered[offset] = (limit, items)
+                while buffered:
+                    if ordered:
+                        if next_offset not in buffered:
+                            break
+                        limit, items = buffered.pop(next_offset)
+                        next_offset += limit
+                    else:
+                        _, (_, items) = buffered.popitem()
+                    window.release()
+                    yield items
+        finally:
+            runner.cancel()
 
     async def get_all_objects(
         self, collection: str, rql: str | None = None
     ) -> list[dict[str, Any]]:
-        semaphore = Semaphore(CONCURRENCY)
-
-        async def fetch_page(offset):
-            async with semaphore:
-                response = await self.list_objects(collection, ITEMS_PER_PAGE, offset, rql)
-                return response["items"]
-
-        response = await self.list_objects(collection, 0, 0, rql)
-        total = response["total"]
-        offset = 0
-        tasks = []
-        while offset < total:
-            tasks.append(asyncio.create_task(fetch_page(offset)))
-            offset += ITEMS_PER_PAGE
-
-        all_items = []
-        pages = await asyncio.gather(*tasks)
-        for page in pages:
-            all_items.extend(page)
-        return all_items
+        return [item async for item in self.iter_all_objects(collection, rql)]
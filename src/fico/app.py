@@ -1,10 +1,14 @@
+from httpx import HTTPError
+from textual import work
 from textual.app import App
 from textual.binding import Binding
+from textual.widget import AwaitMount
 
 from fico.api import FFCOpsClient
 from fico.screens.invitation import InvitationDialog
 from fico.screens.login import LoginDialog
 from fico.screens.main import MainScreen
+from fico.widgets.datagrid import DataGrid
 
 
 class Fico(App):
@@ -33,10 +37,41 @@ class Fico(App):
 
     async def on_mount(self):
         self.api_client = FFCOpsClient()
-        if await self.api_client.can_connect():
-            self.push_screen(MainScreen(self.api_client))
-        else:
+        if not self.api_client.config.is_configured():
             self.push_screen(LoginDialog(), self.login_or_quit)
+            return
+        # Render the main screen from the saved config right away, so that the first
+        # page is loaded while the saved credentials are checked.
+        main_screen = MainScreen(self.api_client)
+        mounted = self.push_screen(main_screen)
+        self.check_connection(main_screen, mounted)
+
+    @work(exclusive=True, group="startup")
+    async def check_connection(self, main_screen: MainScreen, mounted: AwaitMount) -> None:
+        try:
+            connected = await self.api_client.can_connect()
+        except HTTPError as e:
+            self.notify(
+                severity="error",
+                title="Error",
+                message=f"Cannot connect to the API: {e}",
+            )
+            return
+        if connected:
+            main_screen.update_rql_help()
+            return
+        # The credentials can be rejected before the main screen is mounted, wait for it
+        # so that it is removed as a whole together with the screens pushed on top of it.
+        await mounted
+        await self.close_main_screen(main_screen)
+        self.push_screen(LoginDialog(), self.login_or_quit)
+
+    async def close_main_screen(self, main_screen: MainScreen) -> None:
+        """Cancels the reloads of the `main_screen` grids and removes it from the stack."""
+        for grid in main_screen.query(DataGrid):
+            self.workers.cancel_node(grid)
+        while main_screen in self.screen_stack:
+            await self.pop_screen()
 
     async def login_or_quit(self, login_data: dict[str, str] | None) -> None:
         if not login_data:
@@ -0,0 +1,136 @@
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any | None:
+        entry = self.entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class PageStore:
+    """
+    Objects of the current page of a grid by id, plus the ones of the last `max_pages`
+    pages shown before it: pages shown again move back to the end, the least recently
+    shown ones are evicted first.
+    """
+
+    def __init__(self, max_pages: int) -> None:
+        self.max_pages = max_pages
+        self.pages: OrderedDict[Hashable, dict[str, dict[str, Any]]] = OrderedDict()
+
+    @property
+    def current(self) -> dict[str, dict[str, Any]]:
+        return next(reversed(self.pages.values()), {})
+
+    def set_page(self, key: Hashable, objects: list[dict[str, Any]]) -> None:
+        self.pages[key] = {obj["id"]: obj for obj in objects}
+        self.pages.move_to_end(key)
+        while len(self.pages) > self.max_pages + 1:
+            self.pages.popitem(last=False)
+
+    def get(self, id: str) -> dict[str, Any] | None:
+        for page in reversed(self.pages.values()):
+            if id in page:
+                return page[id]
+        return None
+
+    def clear(self) -> None:
+        self.pages.clear()
+
+    def __len__(self) -> int:
+        return sum(len(page) for page in self.pages.values())
+
+
+class Entity(dict):
+    """An API object held by the `EntityStore`, dicts cannot be referenced weakly."""
+
+    __slots__ = ("__weakref__",)
+
+
+def get_resource_type(collection: str) -> str:
+    """Returns the type of the objects of a collection path, e.g. `users/{id}/accounts`."""
+    return collection.rsplit("/", 1)[-1]
+
+
+class EntityStore:
+    """
+    Identity map of the API objects by resource type and id: every version of an object
+    received from the API, from any collection, updates the same `Entity` in place, so
+    that all the grids, caches and screens holding it see the new version. Entities are
+    dropped as soon as nobody references them anymore. Subscribers are called with the
+    entities that changed.
+    """
+
+    def __init__(self) -> None:
+        self.entities: weakref.WeakValueDictionary[tuple[str, str], Entity] = (
+            weakref.WeakValueDictionary()
+        )
+        self.subscribers: list[Callable[[Entity], None]] = []
+
+    def put(self, collection: str, obj: Any) -> Any:
+        """Stores `obj` and returns the entity to hold instead of it."""
+        if not isinstance(obj, dict) or "id" not in obj:
+            return obj
+        key = (get_resource_type(collection), obj["id"])
+        entity = self.entities.get(key)
+        if entity is None:
+            entity = self.entities[key] = Entity(obj)
+            return entity
+        # Nested collections can return fewer fields, keep the ones they do not carry.
+        if entity is not obj and any(
+            name not in entity or entity[name] != value for name, value in obj.items()
+        ):
+            entity.update(obj)
+            for callback in list(self.subscribers):
+                callback(entity)
+        return entity
+
+    def get(self, collection: str, id: str) -> Entity | None:
+        return self.entities.get((get_resource_type(collection), id))
+
+    def subscribe(self, callback: Callable[[Entity], None]) -> None:
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Entity], None]) -> None:
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def clear(self) -> None:
+        self.entities.clear()
+
+    def __len__(self) -> int:
+        return len(self.entities)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from fico.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrency:
+    """AIMD controller of the concurrency and the page size of bulk pagination."""
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        limit: int,
+        min_limit: int,
+        max_limit: int,
+        page_size: int,
+        min_page_size: int,
+        max_page_size: int,
+        window: int = 20,
+        latency_tolerance: float = 1.5,
+    ) -> None:
+        self.metrics = metrics
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.page_size = page_size
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.latency_tolerance = latency_tolerance
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.baseline_p95: float | None = None
+        self.decreased_at = float("-inf")
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+        self.publish("initial")
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None, None]:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.in_flight -= 1
+                self.condition.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        if len(self.latencies) < (self.latencies.maxlen or 0):
+            return
+        p95 = self.p95()
+        self.metrics.set("pagination.p95", p95)
+        if self.baseline_p95 is None or p95 < self.baseline_p95:
+            self.baseline_p95 = p95
+        if p95 > self.baseline_p95 * self.latency_tolerance:
+            self.decrease(f"p95 {p95:.3f}s above baseline {self.baseline_p95:.3f}s")
+        else:
+            self.increase(f"p95 {p95:.3f}s within baseline {self.baseline_p95:.3f}s")
+
+    def record_throttled(self, status_code: int, sent_at: float) -> None:
+        """Records a throttling response to a request sent at `sent_at` (monotonic)."""
+        if sent_at < self.decreased_at:
+            self.metrics.incr("pagination.throttles_ignored")
+            return
+        self.decrease(f"HTTP {status_code}")
+
+    def increase(self, reason: str) -> None:
+        self.latencies.clear()
+        if self.limit < self.max_limit:
+            self.limit += 1
+        elif self.page_size < self.max_page_size:
+            self.page_size = min(self.max_page_size, self.page_size + self.min_page_size)
+            # Latency grows with the page size, start over with a new baseline.
+            self.baseline_p95 = None
+        else:
+            return
+        self.metrics.incr("pagination.increases")
+        self.publish(f"increase: {reason}")
+
+    def decrease(self, reason: str) -> None:
+        self.latencies.clear()
+        self.decreased_at = time.monotonic()
+        self.limit = max(self.min_limit, self.limit // 2)
+        self.page_size = max(self.min_page_size, self.page_size // 2)
+        self.metrics.incr("pagination.decreases")
+        self.publish(f"decrease: {reason}")
+
+    def p95(self) -> float:
+        latencies = sorted(self.latencies)
+        return latencies[math.ceil(len(latencies) * 0.95) - 1]
+
+    def publish(self, decision: str) -> None:
+        logger.info(
+            f"{self.__class__.__name__} {decision} -> "
+            f"concurrency={self.limit} page_size={self.page_size}"
+        )
+        self.metrics.set("pagination.concurrency", self.limit)
+        self.metrics.set("pagination.page_size", self.page_size)
+        self.metrics.set("pagination.last_decision", decision)
@@ -1,18 +1,22 @@
+import hashlib
 import json
 from pathlib import Path
 from typing import Any
 
 
 class Config:
-    def __init__(self):
-        self.config_file_path = Path("~").expanduser() / ".fico"
-        self.config_file_path.mkdir(exist_ok=True)
-        self.config = {}
+    def __init__(self, config_file_path: Path | None = None):
+        self.config_file_path = config_file_path or Path("~").expanduser() / ".fico"
+        self.config_file_path.mkdir(parents=True, exist_ok=True)
+        self.config: dict[str, Any] = {}
         self.load_config()
 
     def get_access_token(self) -> str | None:
+        return self.get_account_access_token(self.get_last_used_account()["id"])
+
+    def get_account_access_token(self, account_id: str) -> str | None:
         credentials = self.config.setdefault("credentials", {})
-        return credentials.get(self.get_last_used_account()["id"])
+        return credentials.get(account_id)
 
     def is_configured(self) -> bool:
         return bool(self.config)
@@ -48,6 +52,15 @@ class Config:
         self.config["url"] = url
         self.save_config()
 
+    def get_rate_limit(self, url: str) -> float | None:
+        return self.config.get("rate_limits", {}).get(url)
+
+    def is_http_cache_enabled(self) -> bool:
+        return self.config.get("http_cache", False)
+
+    def get_cache_path(self, name: str, url: str) -> Path:
+        return self.config_file_path / name / hashlib.sha256(url.encode()).hexdigest()
+
     def load_config(self) -> None:
         try:
             with open(self.config_file_path / "config.json") as f:
@@ -1,6 +1,6 @@
-import pycountry
+import functools
 
-from fico.utils import format_currency
+from fico.utils import get_currency_labels
 
 EXCLUDED_CURRENCIES = [
     "XAU",  # gold
@@ -16,11 +16,18 @@ EXCLUDED_CURRENCIES = [
     "XTS",  # reserved for testign
     "XXX",  # No currency
 ]
-CURRENCIES = [
-    (format_currency(currency.alpha_3), currency.alpha_3)
-    for currency in pycountry.currencies
-    if currency.alpha_3 not in EXCLUDED_CURRENCIES
-]
+
+
+@functools.cache
+def get_currencies() -> list[tuple[str, str]]:
+    """Returns the currency select options, built on first use."""
+    return [
+        (label, code)
+        for code, label in get_currency_labels().items()
+        if code not in EXCLUDED_CURRENCIES
+    ]
+
+
 APIS = [
     (
         "https://cloudspend.velasuci.com/ops/v1",
@@ -45,3 +52,14 @@ APIS = [
 ]
 
 DEFAULT_API = "https://api.finops.softwareone.com/ops/v1"
+
+# Client side requests per second cap for each API, the smaller staging
+# stacks get a lower one.
+RATE_LIMITS = {
+    "https://cloudspend.velasuci.com/ops/v1": 10,
+    "https://api.finops.s1.today/ops/v1": 10,
+    "https://api.finops.s1.show/ops/v1": 10,
+    "https://api.finops.s1.live/ops/v1": 25,
+    "https://api.finops.softwareone.com/ops/v1": 25,
+}
+DEFAULT_RATE_LIMIT = 10
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from httpx import AsyncBaseTransport, AsyncHTTPTransport, Request, Response, codes
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the encoded body on the wire, the cache stores the decoded one.
+EXCLUDED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CachingTransport(AsyncBaseTransport):
+    """Transport keeping the GET responses on disk and revalidating them conditionally."""
+
+    def __init__(
+        self,
+        directory: Path,
+        scope: Callable[[], str],
+        max_size: int,
+        transport: AsyncBaseTransport | None = None,
+    ) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.scope = scope
+        self.max_size = max_size
+        self.transport = transport or AsyncHTTPTransport()
+        # Bytes taken by the stored bodies, scanned from disk on the first store.
+        self.size: int | None = None
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        key = self.get_key(request)
+        entry = self.load(key)
+        if entry:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == codes.NOT_MODIFIED and entry:
+            await response.aclose()
+            logger.debug(f"{request.url} not modified, serve it from the HTTP cache")
+            return Response(
+                codes.OK,
+                headers=entry["headers"],
+                content=self.get_body_path(key).read_bytes(),
+                request=request,
+                extensions={"from_cache": True},
+            )
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != codes.OK or not (etag or last_modified):
+            return response
+
+        content = await response.aread()
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in EXCLUDED_HEADERS
+        ]
+        self.store(
+            key,
+            {
+                "url": str(request.url),
+                "etag": etag,
+                "last_modified": last_modified,
+                "headers": headers,
+            },
+            content,
+        )
+        return Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def get_key(self, request: Request) -> str:
+        return hashlib.sha256(f"{self.scope()}|{request.url}".encode()).hexdigest()
+
+    def get_meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get_body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        try:
+            with open(self.get_meta_path(key)) as f:
+                entry = json.load(f)
+            os.utime(self.get_body_path(key))
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def store(self, key: str, entry: dict[str, Any], content: bytes) -> None:
+        body_path = self.get_body_path(key)
+        try:
+            replaced_size = body_path.stat().st_size
+        except OSError:
+            replaced_size = 0
+        try:
+            body_path.write_bytes(content)
+            with open(self.get_meta_path(key), "w") as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logger.warning(f"Cannot store {entry['url']} in the HTTP cache: {e}")
+            self.size = None
+            return
+        if self.size is None:
+            self.size = sum(size for _, size, _ in self.scan())
+        else:
+            self.size += len(content) - replaced_size
+        if self.size > self.max_size:
+            self.evict()
+
+    def scan(self) -> list[tuple[int, int, Path]]:
+        """Returns the modification time, size and path of the stored bodies."""
+        return [
+            (entry.stat().st_mtime_ns, entry.stat().st_size, Path(entry.path))
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".body")
+        ]
+
+    def evict(self) -> None:
+        bodies = sorted(self.scan())
+        size = sum(body_size for _, body_size, _ in bodies)
+        for _, body_size, body_path in bodies:
+            if size <= self.max_size:
+                break
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix(".json").unlink(missing_ok=True)
+            size -= body_size
+        self.size = size
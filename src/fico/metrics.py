@@ -0,0 +1,21 @@
+from typing import Any
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, Any] = {}
+
+    def incr(self, name: str, value: int | float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: Any) -> None:
+        self.gauges[name] = value
+
+    def get(self, name: str) -> Any:
+        if name in self.gauges:
+            return self.gauges[name]
+        return self.counters.get(name, 0)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**self.counters, **self.gauges}
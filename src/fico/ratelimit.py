@@ -0,0 +1,101 @@
+import asyncio
+import heapq
+import itertools
+import time
+import weakref
+from contextvars import ContextVar
+from enum import IntEnum
+
+from fico.metrics import Metrics
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+    BACKGROUND = 2
+
+
+request_priority: ContextVar[Priority] = ContextVar(
+    "request_priority", default=Priority.INTERACTIVE
+)
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared by the requests of a client, served by priority."""
+
+    def __init__(self, rate: float, burst: int | None = None, metrics: Metrics | None = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, round(rate)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.metrics = metrics or Metrics()
+        self.waiters: list[tuple[Priority, int, asyncio.Future, asyncio.Task | None]] = []
+        self.escalations: weakref.WeakKeyDictionary[asyncio.Task, Priority] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.counter = itertools.count()
+        self.timer: asyncio.Handle | None = None
+
+    async def acquire(self, priority: Priority | None = None) -> None:
+        if priority is None:
+            priority = request_priority.get()
+        task = asyncio.current_task()
+        if task is not None:
+            priority = min(priority, self.escalations.get(task, priority))
+        self.refill()
+        if not self.waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), waiter, task))
+        self.metrics.incr(f"ratelimit.waits.{priority.name.lower()}")
+        started_at = time.monotonic()
+        self.schedule()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The token has been granted already, give it back.
+                self.tokens += 1
+                self.schedule()
+            raise
+        finally:
+            self.metrics.incr("ratelimit.wait_time", time.monotonic() - started_at)
+
+    def escalate(self, task: asyncio.Task, priority: Priority) -> None:
+        """Serves the waiting and next requests of `task` at `priority` or higher."""
+        self.escalations[task] = min(priority, self.escalations.get(task, priority))
+        escalated = False
+        for index, (waiter_priority, count, waiter, owner) in enumerate(self.waiters):
+            if owner is task and priority < waiter_priority:
+                self.waiters[index] = (priority, count, waiter, owner)
+                escalated = True
+        if escalated:
+            heapq.heapify(self.waiters)
+            self.metrics.incr("ratelimit.escalations")
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def schedule(self) -> None:
+        if self.timer:
+            return
+        self.timer = asyncio.get_running_loop().call_soon(self.dispatch)
+
+    def dispatch(self) -> None:
+        self.timer = None
+        self.refill()
+        while self.waiters:
+            if self.waiters[0][2].done():
+                heapq.heappop(self.waiters)
+                continue
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+                self.timer = asyncio.get_running_loop().call_later(delay, self.dispatch)
+                return
+            _, _, waiter, _ = heapq.heappop(self.waiters)
+            self.tokens -= 1
+            waiter.set_result(None)
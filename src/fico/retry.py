@@ -0,0 +1,70 @@
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+from httpx import Response, codes
+
+RETRY_STATUSES = frozenset(
+    {
+        codes.TOO_MANY_REQUESTS,
+        codes.BAD_GATEWAY,
+        codes.SERVICE_UNAVAILABLE,
+        codes.GATEWAY_TIMEOUT,
+    }
+)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a `Retry-After` header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    statuses: frozenset[int] = field(default_factory=lambda: RETRY_STATUSES)
+
+    def get_delay(self, attempt: int, response: Response | None = None) -> float:
+        """
+        Returns how long to wait before the retry that follows `attempt` (zero based),
+        honouring the `Retry-After` header of `response` if any, otherwise using an
+        exponential backoff with full jitter.
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the requests sent so that retries cannot amplify
+    an outage: every request deposits `ratio` tokens and every retry withdraws one.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.balance = float(min_retries)
+
+    def deposit(self) -> None:
+        self.balance = min(self.balance + self.ratio, self.min_retries / self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
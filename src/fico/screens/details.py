@@ -6,7 +6,7 @@ from textual.app import ComposeResult
 from textual.containers import Grid, Right
 from textual.keys import Keys
 from textual.screen import ModalScreen
-from textual.widgets import Button, Footer, Label, Markdown, TabbedContent, TabPane
+from textual.widgets import Button, Footer, Label, TabbedContent, TabPane
 
 
 class Details(ModalScreen[None]):
@@ -51,6 +51,8 @@ class Details(ModalScreen[None]):
         self.panes = panes or []
 
     def compose(self) -> ComposeResult:
+        from textual.widgets import Markdown
+
         with Grid():
             yield Label(self.dialog_title)
             with TabbedContent():
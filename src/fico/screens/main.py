@@ -18,6 +18,7 @@ from fico.views.organizations import Organizations
 from fico.views.systems import Systems
 from fico.views.users import Users
 from fico.widgets.navbar import NavBar
+from fico.widgets.view import View
 
 
 class MainScreen(Screen):
@@ -91,7 +92,13 @@ class MainScreen(Screen):
 
     @on(NavBar.Navigate)
     def on_switch_view(self, event: NavBar.Navigate) -> None:
-        self.query_one(ContentSwitcher).current = event.view
+        self.show_view(event.view)
+
+    def show_view(self, view_id: str | None) -> None:
+        switcher = self.query_one(ContentSwitcher)
+        switcher.current = view_id
+        if view_id:
+            switcher.query_one(f"#{view_id}", View).activate()
 
     def action_toggle_menu(self):
         self.query_one(NavBar).toggle_class("-hidden")
@@ -107,7 +114,7 @@ class MainScreen(Screen):
     async def switch_account(self, account):
         if not account:
             return
-        await self.api_client.switch_account(account["id"])
+        await self.api_client.switch_account(account)
         self.current_account = account
         self.setup_for_account()
 
@@ -118,16 +125,21 @@ class MainScreen(Screen):
         )
         self.query_one(Accounts).disabled = self.current_account["type"] != "operations"
         self.query_one(Organizations).disabled = self.current_account["type"] != "operations"
+        # Only the visible view is loaded, the others are loaded when shown.
+        for view in self.query(View):
+            view.invalidate()
         if self.current_account["type"] == "affiliate":
-            self.query_one(ContentSwitcher).current = "entitlements"
             for view in (Entitlements, Users, Systems):
                 self.query_one(view).current_account = self.current_account
-                self.query_one(view).reset()
+            self.show_view("entitlements")
         else:
-            self.query_one(ContentSwitcher).current = "accounts"
             for view in (Accounts, Organizations, Entitlements, Users, Systems):
                 self.query_one(view).current_account = self.current_account
-                self.query_one(view).reset()
+            self.show_view("accounts")
+
+    def update_rql_help(self) -> None:
+        for view in self.query(View):
+            view.update_rql_help()
 
     def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
         if (
@@ -145,19 +157,19 @@ class MainScreen(Screen):
         return True
 
     def action_show_accounts(self):
-        self.query_one(ContentSwitcher).current = "accounts"
+        self.show_view("accounts")
 
     def action_show_organizations(self):
-        self.query_one(ContentSwitcher).current = "organizations"
+        self.show_view("organizations")
 
     def action_show_entitlements(self):
-        self.query_one(ContentSwitcher).current = "entitlements"
+        self.show_view("entitlements")
 
     def action_show_users(self):
-        self.query_one(ContentSwitcher).current = "users"
+        self.show_view("users")
 
     def action_show_systems(self):
-        self.query_one(ContentSwitcher).current = "systems"
+        self.show_view("systems")
 
     def action_show_charges(self):
-        self.query_one(ContentSwitcher).current = "charges"
+        self.show_view("charges")
@@ -0,0 +1,108 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from httpx import AsyncClient, codes
+
+logger = logging.getLogger(__name__)
+
+PAGINATION_PARAMETERS = ("limit", "offset")
+ACTION_METHODS = ("post", "put", "patch", "delete")
+
+
+def is_path_parameter(segment: str) -> bool:
+    return segment.startswith("{") and segment.endswith("}")
+
+
+def build_index(spec: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Builds a compact index of the OpenAPI `spec` that maps every collection path
+    (without the leading slash) to its RQL help, filterable fields and actions.
+    """
+    index: dict[str, dict[str, Any]] = {}
+
+    def get_collection(path: str) -> dict[str, Any]:
+        return index.setdefault(path, {"rql_help": None, "filters": [], "actions": []})
+
+    for path, operations in spec.get("paths", {}).items():
+        segments = path.strip("/").split("/")
+        if not segments[-1] or is_path_parameter(segments[-1]):
+            continue
+        if "get" in operations and not any(map(is_path_parameter, segments)):
+            collection = get_collection("/".join(segments))
+            collection["rql_help"] = operations["get"].get("description")
+            collection["filters"] = [
+                parameter["name"]
+                for parameter in operations["get"].get("parameters", [])
+                if parameter.get("in") == "query" and parameter["name"] not in PAGINATION_PARAMETERS
+            ]
+        if len(segments) >= 3 and is_path_parameter(segments[-2]):
+            collection = get_collection("/".join(segments[:-2]))
+            collection["actions"].extend(
+                {"method": method.upper(), "name": segments[-1]}
+                for method in operations
+                if method in ACTION_METHODS
+            )
+    return index
+
+
+class APISpecs:
+    """
+    Index of the API OpenAPI spec persisted on disk so that it can be used right
+    away on startup, and revalidated in background with a conditional request.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.collections: dict[str, dict[str, Any]] = {}
+
+    def load(self) -> bool:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.collections = data["collections"]
+        except (OSError, KeyError, TypeError, ValueError):
+            return False
+        self.etag = data.get("etag")
+        self.last_modified = data.get("last_modified")
+        return True
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(
+                {
+                    "etag": self.etag,
+                    "last_modified": self.last_modified,
+                    "collections": self.collections,
+                },
+                f,
+            )
+
+    async def fetch(self, client: AsyncClient) -> None:
+        headers = {}
+        if self.collections and self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.collections and self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        response = await client.get("/openapi.json", headers=headers, auth=None)  # type: ignore
+        if response.status_code == codes.NOT_MODIFIED:
+            logger.info("OpenAPI spec not modified")
+            return
+        response.raise_for_status()
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.collections = build_index(response.json())
+        self.save()
+
+    def get_rql_help(self, collection: str) -> str | None:
+        return self.collections.get(collection, {}).get("rql_help")
+
+    def get_filters(self, collection: str) -> list[str]:
+        return self.collections.get(collection, {}).get("filters", [])
+
+    def get_actions(self, collection: str) -> list[dict[str, str]]:
+        return self.collections.get(collection, {}).get("actions", [])
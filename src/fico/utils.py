@@ -2,7 +2,6 @@ import functools
 from datetime import datetime
 from typing import Any
 
-import pycountry
 from rich.text import Text
 from textual import log
 
@@ -17,15 +16,30 @@ def format_by(event: dict[str, Any]) -> str:
 def format_at(event: dict[str, Any]) -> str:
     if "at" not in event:
         return "-"
-    date = datetime.fromisoformat(event["at"])
-    return date.strftime("%d/%m/%Y %H:%M:%S")
+    return format_timestamp(event["at"])
+
+
+@functools.lru_cache(maxsize=4096)
+def format_timestamp(at: str) -> str:
+    return datetime.fromisoformat(at).strftime("%d/%m/%Y %H:%M:%S")
+
+
+@functools.cache
+def get_currency_labels() -> dict[str, str]:
+    """Returns the label of every ISO 4217 currency by code, built on first use."""
+    import pycountry
+
+    return {
+        currency.alpha_3: f"{currency.alpha_3} - {currency.name}"
+        for currency in pycountry.currencies
+    }
 
 
 def format_currency(currency_code: str) -> str:
-    currency = pycountry.currencies.get(alpha_3=currency_code)
-    return f"{currency.alpha_3} - {currency.name}"
+    return get_currency_labels().get(currency_code, currency_code)
 
 
+@functools.cache
 def format_status(status: str) -> Text:
     if status == "active":
         return Text(f"[bold green]{status}[/]")
@@ -60,13 +60,7 @@ class Entitlements(View):
             self.query_one("#fi_owner", FormItem).remove_class("-hidden")
             self.query_one("#owner", Select).disabled = False
             rql = "and(eq(type,affiliate),eq(status,active))&order_by(name)"
-            accounts = await self.api_client.get_all_objects("accounts", rql=rql)
-            self.query_one("#owner", Select).set_options(
-                [
-                    (f"{format_object_label(account)}", account["id"])
-                    for account in accounts
-                ]
-            )
+            await self.load_select_options(self.query_one("#owner", Select), "accounts", rql)
         else:
             self.query_one("fi_owner", FormItem).add_class("-hidden")
             self.query_one("#owner", Select).disabled = True
@@ -128,7 +122,7 @@ class Entitlements(View):
         if not data:
             return
 
-        await self.api_client.execute_object_action(
+        result = await self.api_client.execute_object_action(
             collection=self.get_collection_name(),
             method="POST",
             id=id,
@@ -144,7 +138,7 @@ class Entitlements(View):
                 }
             },
         )
-        self.query_one(DataGrid).reload()
+        self.refresh_object(id, result)
         self.notify(
             title="Success",
             message="Entitlement successfully redeemed",
@@ -156,13 +150,13 @@ class Entitlements(View):
         if not (selected and confirm):
             return
 
-        await self.api_client.execute_object_action(
+        result = await self.api_client.execute_object_action(
             collection=self.get_collection_name(),
             method="POST",
             id=selected["id"],
             action="terminate",
         )
-        self.query_one(DataGrid).reload()
+        self.refresh_object(selected["id"], result)
         self.notify(
             title="Success",
             message="Entitlement successfully terminated",
@@ -5,7 +5,7 @@ from typing import Any
 from textual.validation import Length
 from textual.widgets import Input, Label, Select, TabPane
 
-from fico.constants import CURRENCIES
+from fico.constants import get_currencies
 from fico.screens.actions import Action
 from fico.utils import (
     format_at,
@@ -68,12 +68,12 @@ class Organizations(View):
             ),
             FormItem(
                 Label("Currency"),
-                Select(CURRENCIES, id="currency"),
+                Select([], id="currency"),
                 id="fi_currency",
             ),
             FormItem(
                 Label("Billing Currency"),
-                Select(CURRENCIES, id="billing_currency"),
+                Select([], id="billing_currency"),
                 id="fi_billing_currency",
             ),
             FormItem(
@@ -106,6 +106,8 @@ class Organizations(View):
         self.query_one("#fi_billing_currency", FormItem).remove_class("-hidden")
         self.query_one("#admin_name", Input).disabled = False
         self.query_one("#admin_email", Input).disabled = False
+        self.query_one("#currency", Select).set_options(get_currencies())
+        self.query_one("#billing_currency", Select).set_options(get_currencies())
         self.query_one("#currency", Select).disabled = False
         self.query_one("#billing_currency", Select).disabled = False
 
@@ -168,6 +170,7 @@ class Organizations(View):
             ],
             datasource=partial(self.api_client.get_organization_employees, object["id"]),  # type: ignore
             pagination=False,
+            entities=self.api_client.entities,
         )
         employees_list.reload()
 
@@ -188,6 +191,7 @@ class Organizations(View):
             ],
             datasource=partial(self.api_client.get_organization_datasources, object["id"]),  # type: ignore
             pagination=False,
+            entities=self.api_client.entities,
         )
         datasources_list.reload()
 
@@ -11,7 +11,7 @@ from fico.utils import (
     format_status,
     handle_error_notification,
 )
-from fico.widgets.datagrid import DataGrid, DataGridColumn
+from fico.widgets.datagrid import DataGridColumn
 from fico.widgets.form import FormItem
 from fico.widgets.view import View
 
@@ -25,10 +25,7 @@ class Systems(View):
         if self.is_operations_account:
             self.query_one("#item-owner", FormItem).remove_class("hidden")
             rql = "eq(status,active)&order_by(name)"
-            accounts = await self.api_client.get_all_objects("accounts", rql=rql)
-            self.query_one("#owner", Select).set_options(
-                [(f"{format_object_label(account)}", account["id"]) for account in accounts]
-            )
+            await self.load_select_options(self.query_one("#owner", Select), "accounts", rql)
         else:
             self.query_one("#item-owner", FormItem).add_class("hidden")
 
@@ -50,19 +47,19 @@ class Systems(View):
 
     @handle_error_notification(f"Error disabling {OBJECT_NAME}")
     async def perform_disable(self, system: dict[str, Any]):
-        await self.api_client.execute_object_action(
-            self.get_collection_name(), "POST", system["id"], "disable"
+        result = await self.api_client.execute_object_action(
+            self.get_collection_name(), "POST", system["id"], "disable", safe=True
         )
-        self.query_one(DataGrid).reload()
+        self.refresh_object(system["id"], result)
         self.notify_success(system, "disabled")
 
 
     @handle_error_notification(f"Error enabling {OBJECT_NAME}")
     async def perform_enable(self, system: dict[str, Any]):
-        await self.api_client.execute_object_action(
-            self.get_collection_name(), "POST", system["id"], "enable"
+        result = await self.api_client.execute_object_action(
+            self.get_collection_name(), "POST", system["id"], "enable", safe=True
         )
-        self.query_one(DataGrid).reload()
+        self.refresh_object(system["id"], result)
         self.notify_success(system, "disabled")
 
 
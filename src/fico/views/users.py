@@ -26,10 +26,7 @@ class Users(View):
         if self.is_operations_account:
             self.query_one("#item-account", FormItem).remove_class("hidden")
             rql = "eq(status,active)&order_by(name)"
-            accounts = await self.api_client.get_all_objects("accounts", rql=rql)
-            self.query_one("#account", Select).set_options(
-                [(f"{format_object_label(account)}", account["id"]) for account in accounts]
-            )
+            await self.load_select_options(self.query_one("#account", Select), "accounts", rql)
         else:
             self.query_one("#item-account", FormItem).add_class("hidden")
         self.query_one(Form).form_title = "Invite User"
@@ -53,10 +50,10 @@ class Users(View):
 
     async def perform_disable(self, user: dict[str, Any]):
         try:
-            await self.api_client.execute_object_action(
-                self.get_collection_name(), "POST", user["id"], "disable"
+            result = await self.api_client.execute_object_action(
+                self.get_collection_name(), "POST", user["id"], "disable", safe=True
             )
-            self.query_one(DataGrid).reload()
+            self.refresh_object(user["id"], result)
             self.notify(
                 severity="information",
                 title="Success",
@@ -71,10 +68,10 @@ class Users(View):
 
     async def perform_enable(self, user: dict[str, Any]):
         try:
-            await self.api_client.execute_object_action(
-                self.get_collection_name(), "POST", user["id"], "enable"
+            result = await self.api_client.execute_object_action(
+                self.get_collection_name(), "POST", user["id"], "enable", safe=True
             )
-            self.query_one(DataGrid).reload()
+            self.refresh_object(user["id"], result)
             self.notify(
                 severity="information",
                 title="Success",
@@ -147,7 +144,7 @@ class Users(View):
                 action="accept-invitation",
                 payload={"invitation_token": invitation_data["token"]},
             )
-            self.query_one(DataGrid).reload()
+            self.query_one(DataGrid).schedule_reload()
             self.notify(
                 title="Success",
                 message="Invitation successfully accepted",
@@ -189,6 +186,7 @@ class Users(View):
             ],
             datasource=partial(self.api_client.get_user_accounts, object["id"]),
             actions=self.get_user_account_actions,
+            entities=self.api_client.entities,
             id="user_accounts"
         )
         accounts_list.reload()
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Hashable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
@@ -9,31 +10,78 @@ from textual.app import ComposeResult
 from textual.containers import Grid
 from textual.message import Message
 from textual.reactive import Reactive, reactive
-from textual.widgets import DataTable
+from textual.widgets import DataTable, Label
 
+from fico.cache import Entity, EntityStore, PageStore, TTLCache
+from fico.metrics import Metrics
+from fico.ratelimit import Priority, request_priority
 from fico.screens.actions import Action, Actions
 from fico.screens.notification import Notification
 from fico.widgets.pagination import Pagination
 
 logger = logging.getLogger(__name__)
 
+PAGE_CACHE_SIZE = 8
+PAGE_CACHE_TTL = 30
+RECENT_PAGES = 4
+# Virtual scroll: rows are fetched in blocks and only a window of blocks is kept.
+BLOCK_SIZE = 100
+MAX_BLOCKS = 3
+BLOCK_THRESHOLD = 20
+
+
 @dataclass
 class DataGridColumn:
     title: str
     field: str
     formatter: Callable[[Any], str | Text] | None = None
 
-    def get_field(self, object: dict[str, Any]) -> str:
-        parts = self.field.split(".")
-        obj: dict | str | None = object
-        for part in parts:
-            if not obj or not isinstance(obj, dict):
-                return "-"
-            obj = obj.get(part)
-
-        if not obj:
+    def __post_init__(self) -> None:
+        self.path: tuple[str, ...] = tuple(self.field.split("."))
+
+    def get_value(self, object: dict[str, Any]) -> Any:
+        value: Any = object
+        for part in self.path:
+            if not value or not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    def format(self, value: Any) -> str:
+        if not value:
             return "-"
-        return str(obj if not self.formatter else self.formatter(obj))
+        return str(value if not self.formatter else self.formatter(value))
+
+    def get_field(self, object: dict[str, Any]) -> str:
+        return self.format(self.get_value(object))
+
+    def format_column(self, objects: Iterable[dict[str, Any]]) -> list[str]:
+        """
+        Formats the values of this column for all the `objects`, repeated values are
+        formatted only once.
+        """
+        values = map(self.get_value, objects)
+        if not self.formatter:
+            return [str(value) if value else "-" for value in values]
+        format = self.format
+        formatted: dict[Hashable, str] = {}
+        cells = []
+        for value in values:
+            if type(value).__hash__ is None:
+                cells.append(format(value))
+                continue
+            cell = formatted.get(value)
+            if cell is None:
+                cell = formatted[value] = format(value)
+            cells.append(cell)
+        return cells
+
+
+def format_rows(
+    columns: list[DataGridColumn], objects: list[dict[str, Any]]
+) -> list[tuple[str, ...]]:
+    """Formats a page of `objects` column by column and returns its rows."""
+    return list(zip(*(column.format_column(objects) for column in columns), strict=True))
 
 
 class DataGrid(Grid):
@@ -47,6 +95,12 @@ class DataGrid(Grid):
     DataGrid > DataTable {
         height: 100%;
     }
+    DataGrid > #position {
+        height: 3;
+        width: 100%;
+        content-align: right middle;
+        padding-right: 1;
+    }
     """
 
     BINDINGS = [
@@ -66,50 +120,99 @@ class DataGrid(Grid):
         datasource: Callable[[int, int, str | None], Coroutine[None, None, dict[str, Any]]],
         actions: Callable[[dict[str, Any]], dict[str, Action]] | None = None,
         pagination: bool = True,
+        virtual: bool = False,
+        metrics: Metrics | None = None,
+        entities: EntityStore | None = None,
+        name=None,
         id=None,
         disabled=False,
         markup=True,
     ) -> None:
-        super().__init__(name=None, id=id, classes=None, disabled=disabled, markup=markup)
+        super().__init__(name=name, id=id, classes=None, disabled=disabled, markup=markup)
         self.columns = columns
         self.datasource = datasource
         self.actions = actions
-        self.pagination = pagination
+        self.pagination = pagination and not virtual
+        self.virtual = virtual
+        self.blocks: dict[int, list[dict[str, Any]]] = {}
+        # Position in the collection of the rows of the blocks, by object id.
+        self.positions: dict[str, int] = {}
         self.current_limit = 10
         self.current_offset = 0
-        self.objects: dict[str, dict[str, Any]] = {}
+        self.objects = PageStore(RECENT_PAGES)
+        self.metrics = metrics or Metrics()
+        self.entities = entities
         self.selected_object: dict[str, Any] | None = None
         self.rql_expression: str | None = None
+        self.generation = 0
+        self.reload_scheduled = False
+        self.reload_cached = True
+        self.pages = TTLCache(PAGE_CACHE_SIZE, PAGE_CACHE_TTL)
 
     def compose(self) -> ComposeResult:
         yield DataTable(cursor_type="row", zebra_stripes=True)
         if self.pagination:
             yield Pagination().data_bind(DataGrid.total_rows)
+        if self.virtual:
+            yield Label(id="position")
+
+    def schedule_reload(self, cached: bool = False) -> None:
+        """
+        Reloads the grid after the next refresh of the screen, once the pending messages
+        have been processed, so that the reloads requested in the same frame are merged
+        into one. The merged reload uses the prefetched pages only if all the requests
+        allow it.
+        """
+        self.metrics.incr(f"datagrid.{self.name}.reload_requests")
+        self.reload_cached = cached and (self.reload_cached or not self.reload_scheduled)
+        if self.reload_scheduled:
+            logger.info(f"{self.__class__.__name__} merge reload")
+            return
+        self.reload_scheduled = True
+        self.call_after_refresh(self.run_scheduled_reload)
 
-    @work
-    async def reload(self) -> None:
+    def run_scheduled_reload(self) -> None:
+        self.reload_scheduled = False
+        self.reload(cached=self.reload_cached)
+
+    @work(exclusive=True, group="reload")
+    async def reload(self, cached: bool = False) -> None:
+        """Loads the current page, from the prefetched pages only if `cached` is true."""
         if self.disabled:
             return
-        self.loading = True
+        self.generation += 1
+        generation = self.generation
+        if not cached:
+            self.clear_pages()
+        key = (self.rql_expression, self.current_limit, self.current_offset)
+        data = self.pages.get(key) if self.pagination else None
+        if data:
+            logger.info(f"{self.__class__.__name__} serve prefetched page")
+        self.loading = not data
         logger.info(f"{self.__class__.__name__} reload")
         try:
-            args = []
-            if self.pagination:
-                args = [self.current_limit, self.current_offset, self.rql_expression]
-            data = await self.datasource(*args)  # type: ignore
+            if self.virtual:
+                await self.reload_blocks(generation)
+                return
+            if not data:
+                args = []
+                if self.pagination:
+                    args = [self.current_limit, self.current_offset, self.rql_expression]
+                self.metrics.incr(f"datagrid.{self.name}.fetches")
+                data = await self.datasource(*args)  # type: ignore
+            if generation != self.generation:
+                logger.info(f"{self.__class__.__name__} drop stale page")
+                return
 
             self.total_rows = data.get("total", len(data.get("items", [])))
-            table = self.query_one(DataTable)
-            table.clear()
-            self.selected_object = None
-            self.post_message(self.SelectionChanged(item=None))
-            for object in data["items"]:
-                self.objects[object["id"]] = object
-                table.add_row(
-                    *(column.get_field(object) for column in self.columns), key=object["id"]
-                )
-            table.focus()
+            self.update_rows(data["items"], key)
+            self.query_one(DataTable).focus()
+            if self.pagination:
+                self.pages.set(key, data)
+                self.prefetch()
         except Exception as e:
+            if generation != self.generation:
+                return
             self.app.push_screen(
                 Notification(
                     "Error getting data.",
@@ -119,14 +222,195 @@ class DataGrid(Grid):
             )
         self.loading = False
 
+    def update_rows(self, objects: list[dict[str, Any]], page_key: Hashable = None) -> None:
+        """
+        Shows a new page of `objects` comparing it with the current rows by id: only the
+        changed cells are updated and only the rows that differ are removed or added,
+        so that the cursor stays where it is. The table is rebuilt if no row is kept,
+        if the kept rows changed their order or if new rows come before them.
+        """
+        table = self.query_one(DataTable)
+        keys = [obj["id"] for obj in objects]
+        rows = dict(zip(keys, format_rows(self.columns, objects), strict=True))
+        # Rows are always added with the id of their object as key.
+        current_keys = [row.key.value for row in table.ordered_rows if row.key.value is not None]
+        cursor_key = (
+            current_keys[table.cursor_row] if table.cursor_row < len(current_keys) else None
+        )
+        kept_keys = [key for key in current_keys if key in rows]
+
+        if not kept_keys or kept_keys != list(rows)[: len(kept_keys)]:
+            logger.info(f"{self.__class__.__name__} rebuild rows")
+            table.clear()
+            for key, row in rows.items():
+                table.add_row(*row, key=key)
+        else:
+            for key in current_keys:
+                if key not in rows:
+                    table.remove_row(key)
+            for key in kept_keys:
+                self.update_cells(table, key, rows[key])
+            for key in list(rows)[len(kept_keys) :]:
+                table.add_row(*rows[key], key=key)
+
+        if cursor_key is not None and cursor_key in rows:
+            table.move_cursor(row=table.get_row_index(cursor_key), animate=False)
+
+        self.set_objects(page_key, objects)
+        if self.selected_object and self.selected_object["id"] in self.objects.current:
+            self.selected_object = self.objects.current[self.selected_object["id"]]
+        elif self.selected_object:
+            self.selected_object = None
+            self.post_message(self.SelectionChanged(item=None))
+
+    def update_cells(self, table: DataTable, key: str, row: tuple[str, ...]) -> None:
+        for column_key, old, new in zip(self.column_keys, table.get_row(key), row, strict=True):
+            if old != new:
+                table.update_cell(key, column_key, new)
+
+    async def reload_blocks(self, generation: int) -> None:
+        """Fetches again the blocks in the window, or the first one if there is none."""
+        offsets = sorted(self.blocks) or [0]
+        self.metrics.incr(f"datagrid.{self.name}.fetches")
+        pages = await asyncio.gather(
+            *(self.datasource(BLOCK_SIZE, offset, self.rql_expression) for offset in offsets)  # type: ignore
+        )
+        if generation != self.generation:
+            return
+        self.total_rows = pages[0].get("total", 0)
+        self.blocks = {offset: page["items"] for offset, page in zip(offsets, pages, strict=True)}
+        self.positions = {}
+        for offset in offsets:
+            self.set_positions(offset, self.blocks[offset])
+        self.update_rows(
+            [obj for offset in offsets for obj in self.blocks[offset]], self.rql_expression
+        )
+        self.query_one(DataTable).focus()
+        self.loading = False
+
+    @work(exclusive=True, group="block")
+    async def load_block(self, offset: int) -> None:
+        """
+        Adds the block at `offset` to the window, evicting the block at the other end of
+        the window if it grows over `MAX_BLOCKS`.
+        """
+        generation = self.generation
+        try:
+            data = await self.datasource(BLOCK_SIZE, offset, self.rql_expression)  # type: ignore
+        except Exception as e:
+            logger.warning(f"{self.__class__.__name__} cannot load rows at {offset}: {e}")
+            return
+        if generation != self.generation or offset in self.blocks:
+            return
+
+        table = self.query_one(DataTable)
+        cursor_row = table.cursor_row
+        self.total_rows = data.get("total", self.total_rows)
+        items = [obj for obj in data["items"] if obj["id"] not in self.objects.current]
+        self.blocks[offset] = items
+        self.set_positions(offset, data["items"])
+        if offset > min(self.blocks):
+            for obj, row in zip(items, format_rows(self.columns, items), strict=True):
+                table.add_row(*row, key=obj["id"])
+            if len(self.blocks) > MAX_BLOCKS:
+                evicted = self.blocks.pop(min(self.blocks))
+                for obj in evicted:
+                    table.remove_row(obj["id"])
+                    self.positions.pop(obj["id"], None)
+                table.move_cursor(row=cursor_row - len(evicted), animate=False)
+        else:
+            # Rows can only be appended to the table, rebuild it to prepend the block.
+            if len(self.blocks) > MAX_BLOCKS:
+                for obj in self.blocks.pop(max(self.blocks)):
+                    self.positions.pop(obj["id"], None)
+            objects = [obj for block in sorted(self.blocks) for obj in self.blocks[block]]
+            table.clear()
+            for obj, row in zip(objects, format_rows(self.columns, objects), strict=True):
+                table.add_row(*row, key=obj["id"])
+            table.move_cursor(row=cursor_row + len(items), animate=False)
+        self.set_objects(
+            self.rql_expression, [obj for block in self.blocks.values() for obj in block]
+        )
+        logger.info(f"{self.__class__.__name__} rows window: {sorted(self.blocks)}")
+
+    def set_positions(self, offset: int, items: list[dict[str, Any]]) -> None:
+        """Records the position of the rows of the block fetched at `offset`."""
+        for index, obj in enumerate(items):
+            self.positions.setdefault(obj["id"], offset + index)
+
+    def set_objects(self, key: Hashable, objects: list[dict[str, Any]]) -> None:
+        """Stores the objects shown and publishes the size of the store."""
+        self.objects.set_page(key, objects)
+        self.metrics.set(f"datagrid.{self.name}.objects", len(self.objects))
+
+    @on(DataTable.RowHighlighted)
+    def on_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if not self.virtual or not self.blocks:
+            return
+        first, last = min(self.blocks), max(self.blocks)
+        # Rows of a block already shown by the block before it are not added again, so
+        # the cursor row does not give the position.
+        key = event.row_key.value
+        if key is not None and key in self.positions:
+            position = self.positions[key]
+        else:
+            position = first + event.cursor_row
+        self.query_one("#position", Label).update(f"{position + 1} of {self.total_rows} rows")
+        window_rows = sum(len(block) for block in self.blocks.values())
+        if (
+            event.cursor_row >= window_rows - BLOCK_THRESHOLD
+            and last + BLOCK_SIZE < self.total_rows
+        ):
+            self.load_block(last + BLOCK_SIZE)
+        elif event.cursor_row < BLOCK_THRESHOLD and first > 0:
+            self.load_block(first - BLOCK_SIZE)
+
+    def clear_pages(self) -> None:
+        """Discards the prefetched pages, and the ones that are still being prefetched."""
+        self.workers.cancel_group(self, "prefetch")
+        self.pages.clear()
+
+    @work(exclusive=True, group="prefetch")
+    async def prefetch(self) -> None:
+        """Fetches the pages next to the current one at background priority."""
+        request_priority.set(Priority.BACKGROUND)
+        rql_expression, limit = self.rql_expression, self.current_limit
+        for offset in (self.current_offset + limit, self.current_offset - limit):
+            key = (rql_expression, limit, offset)
+            if not 0 <= offset < self.total_rows or self.pages.get(key):
+                continue
+            try:
+                data = await self.datasource(limit, offset, rql_expression)  # type: ignore
+            except Exception as e:
+                logger.info(f"{self.__class__.__name__} cannot prefetch offset {offset}: {e}")
+                continue
+            if rql_expression == self.rql_expression:
+                self.pages.set(key, data)
+
     async def on_mount(self) -> None:
         table = self.query_one(DataTable)
-        table.add_columns(*(column.title for column in self.columns))
+        self.column_keys = table.add_columns(*(column.title for column in self.columns))
+        if self.entities is not None:
+            self.entities.subscribe(self.update_entity)
+
+    def on_unmount(self) -> None:
+        if self.entities is not None:
+            self.entities.unsubscribe(self.update_entity)
+
+    def update_entity(self, entity: Entity) -> None:
+        """Updates in place the cells of the row showing a new version of `entity`."""
+        table = self.query_one(DataTable)
+        key = entity["id"]
+        if self.objects.get(key) is not entity or key not in table.rows:
+            return
+        self.update_cells(table, key, format_rows(self.columns, [entity])[0])
+        if self.selected_object and self.selected_object["id"] == key:
+            self.selected_object = entity
 
     @on(DataTable.RowSelected)
     def on_row_selected(self, event: DataTable.RowSelected):
         if event.row_key.value:
-            self.selected_object = self.objects[event.row_key.value]
+            self.selected_object = self.objects.get(event.row_key.value)
         self.post_message(self.SelectionChanged(item=event.row_key.value))
 
     @on(Pagination.Navigate)
@@ -136,12 +420,24 @@ class DataGrid(Grid):
         self.current_limit = event.limit
         self.current_offset = event.offset
         logger.info(f"{self.__class__.__name__} navigate -> reload")
-        self.reload()
+        self.schedule_reload(cached=True)
 
     def reset(self, rql_expression: str | None = None) -> None:
+        if self.virtual:
+            # Drop the blocks of the previous filter, including the ones being loaded.
+            self.generation += 1
+            self.workers.cancel_group(self, "block")
+            self.rql_expression = rql_expression
+            self.blocks = {}
+            self.positions = {}
+            self.objects.clear()
+            self.schedule_reload()
+            return
         if not self.pagination:
             return
         self.rql_expression = rql_expression
+        self.clear_pages()
+        self.objects.clear()
         pagination = self.query_one(Pagination)
         pagination.current_offset = 0
         logger.info(f"{self.__class__.__name__} reset -> navigate -> reload")
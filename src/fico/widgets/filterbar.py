@@ -5,8 +5,6 @@ from textual.containers import Horizontal
 from textual.message import Message
 from textual.widgets import Button, Label
 
-from fico.screens.rql import RQLEditor
-
 
 class FilterBar(Horizontal):
     DEFAULT_CSS = """
@@ -55,6 +53,9 @@ class FilterBar(Horizontal):
     @on(Button.Pressed)
     def on_button_pressed(self, event: Button.Pressed):
         event.stop()
+        # The editor loads tree-sitter and the RQL grammar, import it on first use.
+        from fico.screens.rql import RQLEditor
+
         self.app.push_screen(
             RQLEditor(self.rql_query, help_text=self.help_text), self.on_rql_editor_dismiss  # type: ignore
         )
@@ -3,7 +3,7 @@ from typing import Any
 from textual import log, on
 from textual.containers import Container, Grid, Horizontal
 from textual.reactive import Reactive, reactive
-from textual.widgets import ContentSwitcher, TabPane
+from textual.widgets import ContentSwitcher, Select, TabPane
 
 from fico.api import FFCOpsClient
 from fico.screens.actions import Action
@@ -36,6 +36,7 @@ class View(Container):
     OBJECT_NAME = "Object"
     OBJECT_NAME_PLURAL = "Objects"
     SUPPORT_RQL = True
+    VIRTUAL_SCROLL = False
 
     total_rows: Reactive[int] = reactive(0)
     selected_object: Reactive[dict[str, Any] | None] = reactive(None, bindings=True)
@@ -54,6 +55,7 @@ class View(Container):
         self.edit_disabled = False
         self.current_account: dict[str, Any] | None = None
         self.current_user: dict[str, Any] | None = None
+        self.stale = True
 
     @classmethod
     def get_collection_name(cls) -> str:
@@ -81,11 +83,21 @@ class View(Container):
                         columns=self.get_columns(),
                         datasource=self.list_objects,
                         actions=self.get_available_actions,
+                        virtual=self.VIRTUAL_SCROLL,
+                        metrics=self.api_client.metrics,
+                        entities=self.api_client.entities,
+                        name=self.get_collection_name(),
                         disabled=self.disabled,
                     )
             if form_items:
                 yield Form(*form_items, id="form")
 
+    def update_rql_help(self) -> None:
+        if not self.SUPPORT_RQL:
+            return
+        for filter_bar in self.query(FilterBar):
+            filter_bar.help_text = self.api_client.get_rql_help(self.get_collection_name())
+
     @on(TopBar.ActionsPressed)
     def on_actions(self, event: TopBar.ActionsPressed):
         self.query_one(DataGrid).show_actions()
@@ -121,10 +133,12 @@ class View(Container):
             obj = await self.create_object(payload)
 
         if obj:
-            self.show_grid()
+            # An updated object is shown in place by the grid, only new ones need a reload.
+            self.show_grid(reload=not event.object_id)
 
-    def show_grid(self):
-        self.query_one(DataGrid).reset()
+    def show_grid(self, reload: bool = True):
+        if reload:
+            self.query_one(DataGrid).reset()
         self.query_one(ContentSwitcher).current = "list"
         self.current_view = "list"
         self.query_one(Form).reset()
@@ -184,6 +198,16 @@ class View(Container):
     async def prepare_add_form(self) -> None:
         pass
 
+    async def load_select_options(self, select: Select, collection: str, rql: str) -> None:
+        """Adds the options to `select` as their pages arrive, keeping the selected one."""
+        options: list[tuple[str, Any]] = []
+        async for page in self.api_client.iter_all_pages(collection, rql=rql):
+            options.extend((format_object_label(obj), obj["id"]) for obj in page)
+            value = select.value
+            select.set_options(options)
+            if value != Select.NULL:
+                select.value = value
+
     async def prepare_edit_form(self, selected) -> dict[str, Any] | None:
         return await self.get_object(selected["id"])
 
@@ -201,6 +225,14 @@ class View(Container):
         return actions
 
 
+    def refresh_object(self, id: str, result: Any) -> None:
+        """
+        Reloads the grid after an action on the object `id`, unless the action returned
+        the new version of the object, which has already been updated in place.
+        """
+        if not (isinstance(result, dict) and result.get("id") == id):
+            self.query_one(DataGrid).schedule_reload()
+
     def get_details_extra_panes(self, object: dict[str, Any]) -> list[TabPane]:
         return []
 
@@ -240,7 +272,6 @@ class View(Container):
             return
         self.notify_deleted_success(object)
 
-    @handle_error_notification(f"Error fetching {OBJECT_NAME_PLURAL}")
     async def list_objects(self, limit: int, offset: int, rql_query: str | None) -> dict[str, Any]:
         return await self.api_client.list_objects(
             self.get_collection_name(), limit, offset, rql_query
@@ -249,6 +280,7 @@ class View(Container):
     def reset(self):
         if self.disabled:
             return
+        self.stale = False
         self.query_one(ContentSwitcher).current = "list"
         self.current_view = "list"
         self.query_one(DataGrid).reset()
@@ -256,10 +288,18 @@ class View(Container):
         self.query_one(TopBar).reset()
         self.selected_object = None
 
+    def invalidate(self) -> None:
+        self.stale = True
+
+    def activate(self) -> None:
+        """Resets the view when it is shown if its data is stale."""
+        if self.stale:
+            self.reset()
+
     def watch_disabled(self, disabled):
         self.query_one(DataGrid).disabled = disabled
         if not disabled:
-            self.reset()
+            self.invalidate()
         return super().watch_disabled(disabled)
 
     def show_notification(
@@ -1,5 +1,6 @@
 from collections.abc import Generator
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
@@ -31,12 +32,14 @@ def mock_base_url() -> Generator[None, None, None]:
 
 
 @pytest.fixture()
-def config_mocker(mocker: MockerFixture) -> ConfigMocker:
+def config_mocker(mocker: MockerFixture, tmp_path: Path) -> ConfigMocker:
     def _mocker(config: dict | None = None) -> ConfigManager:
         config = config or {}
         mocker.patch.object(ConfigManager, "load_config")
         mocker.patch.object(ConfigManager, "save_config")
-        manager = ConfigManager()
+        # Keep the caches saved next to the config, like the OpenAPI spec index, out
+        # of the home directory.
+        manager = ConfigManager(tmp_path / ".fico")
         manager.config = config
         mocker.patch("fico.api.ConfigManager", return_value=manager)
         return manager
@@ -62,6 +65,7 @@ def mock_openapi_spec(httpx_mock: HTTPXMock) -> None:
         method="GET",
         url="https://localhost/ops/v1/openapi.json",
         json={"paths": {"/accounts": {"get": {"description": "rql help"}}}},
+        is_optional=True,
     )
 
 
@@ -172,5 +176,6 @@ def mock_lists(
                     method="GET",
                     url=f"https://localhost/ops/v1/{name}?limit={page['limit']}&offset={page['offset']}",
                     json=page,
+                    is_optional=True,
                 )
     return _mock
@@ -1,5 +1,6 @@
 from typing import Any
 
+from pytest_httpx import HTTPXMock
 from textual.keys import Keys
 from textual.pilot import Pilot
 from textual.widgets import Input, Select
@@ -101,3 +102,32 @@ def test_lists_operations_account_change_rows_per_page(
         await pilot.pause()
 
     assert snap_compare(Fico(), terminal_size=(120, 35), run_before=run_before)
+
+
+async def test_loads_only_the_visible_view(
+    config_mocker: ConfigMocker,
+    default_config: dict[str, Any],
+    mock_check_user: Any,
+    mock_lists: ListsMocker,
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(default_config)
+    mock_lists()
+
+    def get_listed_collections() -> set[str]:
+        return {
+            request.url.path.rsplit("/", 1)[-1]
+            for request in httpx_mock.get_requests(method="GET")
+            if request.url.params
+        }
+
+    app = Fico()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        assert get_listed_collections() == {"accounts"}
+
+        await pilot.press(Keys.ControlO)
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        assert get_listed_collections() == {"accounts", "organizations"}
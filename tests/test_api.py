@@ -0,0 +1,711 @@
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from pytest_mock import MockerFixture
+
+from fico.api import APIError, FFCOpsClient
+from fico.ratelimit import Priority, TokenBucket, request_priority
+from fico.retry import RetryPolicy
+from fico.specs import APISpecs
+from tests.types import ConfigMocker
+
+
+def make_jwt(expires_in: float) -> str:
+    claims = json.dumps({"sub": "FUSR-1234", "exp": int(time.time() + expires_in)})
+    payload = base64.urlsafe_b64encode(claims.encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def paginate(total: int, max_limit: int | None = None, echo_limit: bool = True):
+    """Returns a callback serving a collection of `total` objects, capping the page size."""
+
+    async def serve_page(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params["offset"])
+        if max_limit:
+            limit = min(limit, max_limit)
+        items = [{"id": f"FACC-{i:04}"} for i in range(offset, min(offset + limit, total))]
+        page = {"total": total, "offset": offset, "items": items}
+        if echo_limit:
+            page["limit"] = limit
+        return httpx.Response(200, json=page)
+
+    return serve_page
+
+
+@pytest.fixture()
+def api_config(default_config: dict[str, Any]) -> dict[str, Any]:
+    return {**default_config, "url": "https://localhost/ops/v1"}
+
+
+async def test_refresh_token_single_flight(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config = config_mocker(api_config)
+
+    async def check_token(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        if request.headers["Authorization"] == "Bearer access_token":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+    httpx_mock.add_callback(check_token, method="GET", is_reusable=True)
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/auth/tokens",
+        json={"access_token": "new_access_token", "refresh_token": "new_refresh_token"},
+    )
+
+    client = FFCOpsClient()
+    objects = await asyncio.gather(
+        *(client.get_object("accounts", f"FACC-{i:04}") for i in range(10))
+    )
+
+    assert [obj["id"] for obj in objects] == [f"FACC-{i:04}" for i in range(10)]
+    assert len(httpx_mock.get_requests(method="POST")) == 1
+    assert config.config["credentials"] == {
+        "FACC-5678": "new_access_token",
+        "refresh_token": "new_refresh_token",
+    }
+
+
+async def test_refresh_expiring_token_before_request(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    expiring_token = make_jwt(expires_in=5)
+    fresh_token = make_jwt(expires_in=3600)
+    api_config["credentials"]["FACC-5678"] = expiring_token
+    config_mocker(api_config)
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/auth/tokens",
+        json={"access_token": fresh_token, "refresh_token": "new_refresh_token"},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts/FACC-1234",
+        match_headers={"Authorization": f"Bearer {fresh_token}"},
+        json={"id": "FACC-1234"},
+    )
+
+    client = FFCOpsClient()
+    assert await client.get_object("accounts", "FACC-1234") == {"id": "FACC-1234"}
+    assert [request.method for request in httpx_mock.get_requests()] == ["POST", "GET"]
+
+
+async def test_refresh_token_in_background(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    mocker: MockerFixture,
+):
+    mocker.patch("fico.api.TOKEN_EXPIRY_LEEWAY", 0)
+    api_config["credentials"]["FACC-5678"] = make_jwt(expires_in=1)
+    config = config_mocker(api_config)
+    fresh_token = make_jwt(expires_in=7200)
+    httpx_mock.add_response(method="GET", json={"id": "FACC-1234"})
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/auth/tokens",
+        json={"access_token": fresh_token, "refresh_token": "new_refresh_token"},
+    )
+
+    client = FFCOpsClient()
+    await client.get_object("accounts", "FACC-1234")
+    await asyncio.sleep(0.6)
+
+    assert config.get_access_token() == fresh_token
+
+
+async def test_switch_account_cancels_token_refresh(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    mocker: MockerFixture,
+):
+    mocker.patch("fico.api.TOKEN_EXPIRY_LEEWAY", 0)
+    api_config["credentials"]["FACC-5678"] = make_jwt(expires_in=1)
+    affiliate_token = make_jwt(expires_in=3600)
+    api_config["credentials"]["FACC-1234"] = affiliate_token
+    config = config_mocker(api_config)
+    affiliate = {"id": "FACC-1234", "name": "Affiliate", "type": "affiliate"}
+    httpx_mock.add_response(method="GET", json={"id": "FACC-1234"})
+
+    async def slow_refresh(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(
+            200, json={"access_token": make_jwt(3600), "refresh_token": "new_refresh_token"}
+        )
+
+    httpx_mock.add_callback(slow_refresh, method="POST", is_optional=True)
+
+    client = FFCOpsClient()
+    await client.get_object("accounts", "FACC-1234")
+    assert client.auth
+    assert client.auth.refresh_timer
+    await client.switch_account(affiliate)
+    assert not client.auth.refresh_timer
+
+    client.auth.refresh_in_background(affiliate_token)
+    await asyncio.sleep(0.01)
+    await client.switch_account(affiliate)
+    await asyncio.sleep(0.6)
+
+    assert config.get_access_token() == affiliate_token
+    assert config.get_refresh_token() == "refresh_token"
+
+
+async def test_switch_account_reuses_cached_token(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    affiliate_token = make_jwt(expires_in=3600)
+    api_config["credentials"]["FACC-1234"] = affiliate_token
+    config = config_mocker(api_config)
+    affiliate = {"id": "FACC-1234", "name": "Affiliate", "type": "affiliate"}
+
+    client = FFCOpsClient()
+    await client.switch_account(affiliate)
+
+    assert not httpx_mock.get_requests()
+    assert config.get_last_used_account() == affiliate
+    assert client.get_access_token() == affiliate_token
+
+
+async def test_switch_account_exchanges_expired_token(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    api_config["credentials"]["FACC-1234"] = make_jwt(expires_in=-60)
+    config = config_mocker(api_config)
+    affiliate = {"id": "FACC-1234", "name": "Affiliate", "type": "affiliate"}
+    fresh_token = make_jwt(expires_in=3600)
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/auth/tokens",
+        match_json={"account": {"id": "FACC-1234"}, "refresh_token": "refresh_token"},
+        json={
+            "account": affiliate,
+            "access_token": fresh_token,
+            "refresh_token": "new_refresh_token",
+        },
+    )
+
+    client = FFCOpsClient()
+    await client.switch_account(affiliate)
+
+    assert config.get_last_used_account() == affiliate
+    assert client.get_access_token() == fresh_token
+    assert client.get_refresh_token() == "new_refresh_token"
+
+
+async def test_retry_idempotent_request(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_response(method="GET", status_code=502)
+    httpx_mock.add_response(method="GET", status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(method="GET", json={"id": "FACC-1234"})
+
+    client = FFCOpsClient()
+    client.retry_policy = RetryPolicy(base_delay=0)
+
+    assert await client.get_object("accounts", "FACC-1234") == {"id": "FACC-1234"}
+    assert client.metrics.get("retry.attempts") == 2
+
+
+async def test_do_not_retry_non_idempotent_request(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_response(method="POST", status_code=502)
+
+    client = FFCOpsClient()
+    client.retry_policy = RetryPolicy(base_delay=0)
+
+    with pytest.raises(APIError):
+        await client.create_object("accounts", {"name": "Test"})
+    assert len(httpx_mock.get_requests()) == 1
+    assert client.metrics.get("retry.attempts") == 0
+
+
+async def test_retry_safe_object_action(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    url = "https://localhost/ops/v1/users/FUSR-1234/disable"
+    httpx_mock.add_response(method="POST", url=url, status_code=503)
+    httpx_mock.add_response(method="POST", url=url, json={"id": "FUSR-1234"})
+
+    client = FFCOpsClient()
+    client.retry_policy = RetryPolicy(base_delay=0)
+
+    result = await client.execute_object_action("users", "POST", "FUSR-1234", "disable", safe=True)
+    assert result == {"id": "FUSR-1234"}
+    assert client.metrics.get("retry.attempts") == 1
+
+
+async def test_retry_budget_exhausted(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_response(method="GET", status_code=503, is_reusable=True)
+
+    client = FFCOpsClient()
+    client.retry_policy = RetryPolicy(base_delay=0)
+    client.retry_budget.balance = 1
+
+    with pytest.raises(APIError) as excinfo:
+        await client.get_object("accounts", "FACC-1234")
+    assert excinfo.value.status_code == 503
+    assert client.metrics.get("retry.attempts") == 1
+    assert client.metrics.get("retry.budget_exhausted") == 1
+
+
+async def test_coalesce_identical_requests(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts?limit=10&offset=0",
+        json={"total": 0, "limit": 10, "offset": 0, "items": []},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts/FACC-1234",
+        json={"id": "FACC-1234"},
+    )
+
+    client = FFCOpsClient()
+    first_page, second_page, first_obj, second_obj = await asyncio.gather(
+        client.list_objects("accounts", 10, 0),
+        client.list_objects("accounts", 10, 0),
+        client.get_object("accounts", "FACC-1234"),
+        client.get_object("accounts", "FACC-1234"),
+    )
+
+    assert first_page is second_page
+    assert first_obj is second_obj
+    assert len(httpx_mock.get_requests()) == 2
+    assert client.metrics.get("coalesced") == 2
+    assert not client.inflight
+
+
+async def test_get_object_served_from_listed_objects(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    account = {"id": "FACC-1234", "name": "Test", "status": "active"}
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts?limit=10&offset=0",
+        json={"total": 1, "limit": 10, "offset": 0, "items": [account]},
+    )
+    httpx_mock.add_response(
+        method="PUT",
+        url="https://localhost/ops/v1/accounts/FACC-1234",
+        json={**account, "name": "Updated"},
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/accounts/FACC-1234/disable",
+        json={**account, "name": "Updated", "status": "disabled"},
+    )
+    httpx_mock.add_response(
+        method="DELETE",
+        url="https://localhost/ops/v1/accounts/FACC-1234",
+        status_code=204,
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts/FACC-1234",
+        json={**account, "status": "deleted"},
+    )
+
+    client = FFCOpsClient()
+    await client.list_objects("accounts", 10, 0)
+    assert await client.get_object("accounts", "FACC-1234") == account
+
+    await client.update_object("accounts", "FACC-1234", {"name": "Updated"})
+    assert (await client.get_object("accounts", "FACC-1234"))["name"] == "Updated"
+
+    await client.execute_object_action("accounts", "POST", "FACC-1234", "disable")
+    assert (await client.get_object("accounts", "FACC-1234"))["status"] == "disabled"
+
+    await client.delete_object("accounts", "FACC-1234")
+    assert (await client.get_object("accounts", "FACC-1234"))["status"] == "deleted"
+
+    assert client.metrics.get("object_cache.hits") == 3
+    assert client.metrics.get("object_cache.misses") == 1
+
+
+async def test_update_object_updates_listed_entity(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    account = {"id": "FACC-1234", "name": "Test", "status": "active"}
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts?limit=10&offset=0",
+        json={"total": 1, "limit": 10, "offset": 0, "items": [account]},
+    )
+    httpx_mock.add_response(
+        method="PUT",
+        url="https://localhost/ops/v1/accounts/FACC-1234",
+        json={**account, "name": "Updated"},
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/accounts/FACC-1234/disable",
+        json={**account, "name": "Updated", "status": "disabled"},
+    )
+
+    client = FFCOpsClient()
+    page = await client.list_objects("accounts", 10, 0)
+    listed = page["items"][0]
+
+    assert await client.update_object("accounts", "FACC-1234", {"name": "Updated"}) is listed
+    assert listed["name"] == "Updated"
+    await client.execute_object_action("accounts", "POST", "FACC-1234", "disable")
+    assert listed["status"] == "disabled"
+    assert await client.get_object("accounts", "FACC-1234") is listed
+
+
+async def test_nested_collection_shares_listed_entity(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    account = {"id": "FACC-1234", "name": "Test", "status": "active"}
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/accounts?limit=10&offset=0",
+        json={"total": 1, "limit": 10, "offset": 0, "items": [account]},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/users/FUSR-1234/accounts?limit=10&offset=0",
+        json={"total": 1, "limit": 10, "offset": 0, "items": [{**account, "name": "Renamed"}]},
+    )
+
+    client = FFCOpsClient()
+    listed = (await client.list_objects("accounts", 10, 0))["items"][0]
+    nested = (await client.get_user_accounts("FUSR-1234", 10, 0))["items"][0]
+
+    assert nested is listed
+    assert listed["name"] == "Renamed"
+
+
+async def test_can_connect_loads_specs_concurrently(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    tmp_path: Path,
+):
+    config_mocker(api_config)
+
+    async def check_user(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        assert httpx_mock.get_request(url="https://localhost/ops/v1/openapi.json")
+        return httpx.Response(200, json={"id": "FUSR-1234"})
+
+    httpx_mock.add_callback(check_user, url="https://localhost/ops/v1/users/FUSR-1234")
+
+    client = FFCOpsClient()
+    client.specs = APISpecs(tmp_path / "specs.json")
+
+    assert await client.can_connect()
+    assert client.get_rql_help("accounts") == "rql help"
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(200, text="not json"),
+        httpx.Response(200, json={"paths": []}),
+        httpx.Response(500),
+    ],
+)
+async def test_refresh_specs_keeps_saved_index_on_error(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    tmp_path: Path,
+    response: httpx.Response,
+):
+    config_mocker(api_config)
+    saved = APISpecs(tmp_path / "specs.json")
+    saved.collections = {"accounts": {"rql_help": "saved rql help", "filters": [], "actions": []}}
+    saved.save()
+    httpx_mock.add_callback(
+        lambda _: response, url="https://api.example.com/ops/v1/openapi.json"
+    )
+
+    client = FFCOpsClient()
+    client.client = httpx.AsyncClient(base_url="https://api.example.com/ops/v1")
+    client.specs = APISpecs(tmp_path / "specs.json")
+    await client.fetch_specs()
+    await client.specs_refresh  # type: ignore
+
+    assert client.get_rql_help("accounts") == "saved rql help"
+
+
+async def test_interactive_request_coalesced_onto_background_one(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_callback(paginate(100), method="GET", is_reusable=True)
+    client = FFCOpsClient()
+    client.rate_limiter = TokenBucket(rate=20, burst=1, metrics=client.metrics)
+    await client.rate_limiter.acquire()
+
+    async def prefetch(offset: int) -> dict[str, Any]:
+        request_priority.set(Priority.BACKGROUND)
+        return await client.list_objects("accounts", 10, offset)
+
+    prefetches = [asyncio.create_task(prefetch(offset)) for offset in (10, 20, 30, 0)]
+    await asyncio.sleep(0.01)
+    page = await client.list_objects("accounts", 10, 0)
+
+    assert page["items"][0]["id"] == "FACC-0000"
+    assert get_offsets(httpx_mock) == [0]
+    assert client.metrics.get("coalesced") == 1
+    assert client.metrics.get("ratelimit.escalations") == 1
+    await asyncio.gather(*prefetches)
+
+
+async def test_cancel_coalesced_request_when_nobody_waits(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    cancelled = asyncio.Event()
+
+    async def slow_page(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return httpx.Response(200, json={"total": 0, "limit": 10, "offset": 0, "items": []})
+
+    httpx_mock.add_callback(slow_page, method="GET", is_reusable=True)
+
+    client = FFCOpsClient()
+    first = asyncio.create_task(client.list_objects("accounts", 10, 0))
+    second = asyncio.create_task(client.list_objects("accounts", 10, 0))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert (await second)["total"] == 0
+    assert not cancelled.is_set()
+
+    third = asyncio.create_task(client.list_objects("accounts", 10, 0))
+    await asyncio.sleep(0.01)
+    third.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+    assert client.metrics.get("coalesce.cancelled") == 1
+    assert not client.inflight
+    assert not client.waiters
+
+
+@pytest.mark.parametrize("echo_limit", [True, False])
+async def test_iter_all_objects_when_the_api_caps_the_page_size(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    echo_limit: bool,
+):
+    config_mocker(api_config)
+    httpx_mock.add_callback(
+        paginate(1000, max_limit=100, echo_limit=echo_limit), method="GET", is_reusable=True
+    )
+
+    client = FFCOpsClient()
+    client.concurrency.page_size = 150
+    objects = await client.get_all_objects("accounts")
+
+    assert [obj["id"] for obj in objects] == [f"FACC-{i:04}" for i in range(1000)]
+    limits = [int(request.url.params["limit"]) for request in httpx_mock.get_requests()]
+    assert limits[0] == 150
+    assert set(limits[1:]) == {100}
+    # The cap only applies to the iteration that hit it.
+    assert client.concurrency.page_size == 150
+    assert client.concurrency.max_page_size == 200
+
+
+async def test_bulk_latency_excludes_the_rate_limiter_wait(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_callback(paginate(10), method="GET", is_reusable=True)
+
+    client = FFCOpsClient()
+    client.rate_limiter = TokenBucket(rate=10, burst=1)
+    await client.list_objects("accounts", 10, 0)
+    assert not client.concurrency.latencies
+
+    request_priority.set(Priority.BULK)
+    for offset in range(3):
+        await client.list_objects("accounts", 1, offset)
+
+    assert len(client.concurrency.latencies) == 3
+    assert max(client.concurrency.latencies) < 0.05
+
+
+def get_offsets(httpx_mock: HTTPXMock) -> list[int]:
+    return [int(request.url.params["offset"]) for request in httpx_mock.get_requests()]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_iter_all_objects_when_the_page_size_changes(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    mocker: MockerFixture,
+    ordered: bool,
+):
+    config_mocker(api_config)
+    # A small read-ahead window makes the producer follow the consumer.
+    mocker.patch("fico.api.READ_AHEAD_PAGES", 2)
+    client = FFCOpsClient()
+    client.rate_limiter = TokenBucket(rate=1000)
+    serve_page = paginate(1000)
+
+    async def resize_pages(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        # Later pages are served first, and the page size grows halfway through.
+        await asyncio.sleep((1000 - offset) / 50000)
+        if offset >= 500:
+            client.concurrency.page_size = 150
+        return await serve_page(request)
+
+    httpx_mock.add_callback(resize_pages, method="GET", is_reusable=True)
+
+    ids = [obj["id"] async for obj in client.iter_all_objects("accounts", ordered=ordered)]
+
+    expected = [f"FACC-{i:04}" for i in range(1000)]
+    if ordered:
+        assert ids == expected
+    else:
+        assert ids != expected
+        assert sorted(ids) == expected
+    assert {int(request.url.params["limit"]) for request in httpx_mock.get_requests()} == {
+        100,
+        150,
+    }
+
+
+async def test_iter_all_objects_reads_ahead_a_bounded_window(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    mocker: MockerFixture,
+):
+    config_mocker(api_config)
+    mocker.patch("fico.api.READ_AHEAD_PAGES", 3)
+    httpx_mock.add_callback(paginate(1000), method="GET", is_reusable=True)
+    client = FFCOpsClient()
+    client.rate_limiter = TokenBucket(rate=1000)
+
+    objects = client.iter_all_objects("accounts")
+    assert (await anext(objects))["id"] == "FACC-0000"
+    await asyncio.sleep(0.05)
+    assert get_offsets(httpx_mock) == [0, 100, 200, 300]
+
+    assert len([obj async for obj in objects]) == 999
+    assert len(get_offsets(httpx_mock)) == 10
+
+
+async def test_iter_all_objects_fails_on_the_first_failed_page(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    serve_page = paginate(2000)
+    cancelled = []
+
+    async def fail_page(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        if offset == 200:
+            return httpx.Response(404)
+        if offset > 200:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(offset)
+                raise
+        return await serve_page(request)
+
+    httpx_mock.add_callback(fail_page, method="GET", is_reusable=True)
+    client = FFCOpsClient()
+    client.rate_limiter = TokenBucket(rate=1000)
+
+    ids = []
+
+    async def consume():
+        async for obj in client.iter_all_objects("accounts"):
+            ids.append(obj["id"])
+
+    with pytest.raises(APIError):
+        await consume()
+    await asyncio.sleep(0.01)
+
+    assert ids == [f"FACC-{i:04}" for i in range(200)]
+    requested = get_offsets(httpx_mock)
+    assert sorted(cancelled) == sorted(offset for offset in requested if offset > 200)
+    assert len(requested) < 20
+    await asyncio.sleep(0.05)
+    assert get_offsets(httpx_mock) == requested
+
+
+async def test_iter_all_objects_single_page(
+    config_mocker: ConfigMocker,
+    api_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+):
+    config_mocker(api_config)
+    httpx_mock.add_callback(paginate(5), method="GET", is_reusable=True)
+    client = FFCOpsClient()
+
+    objects = await client.get_all_objects("accounts")
+
+    assert [obj["id"] for obj in objects] == [f"FACC-{i:04}" for i in range(5)]
+    [request] = httpx_mock.get_requests()
+    assert request.url.params["limit"] == str(client.concurrency.page_size)
+    assert request.url.params["offset"] == "0"
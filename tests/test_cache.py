@@ -0,0 +1,82 @@
+import gc
+
+from pytest_mock import MockerFixture
+
+from fico.cache import EntityStore, PageStore, TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries(mocker: MockerFixture):
+    monotonic = mocker.patch("fico.cache.time.monotonic", return_value=100)
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    monotonic.return_value = 104
+    assert cache.get("a") == 1
+    monotonic.return_value = 105
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_pop_and_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_page_store_keeps_recent_pages():
+    store = PageStore(max_pages=2)
+    for offset in range(0, 40, 10):
+        store.set_page(offset, [{"id": f"{offset}-{i}"} for i in range(10)])
+
+    assert len(store) == 30
+    assert set(store.pages) == {10, 20, 30}
+    assert "30-0" in store.current
+    assert store.get("10-5") == {"id": "10-5"}
+    assert store.get("0-5") is None
+
+    store.set_page(10, [{"id": "10-0"}])
+    assert list(store.pages) == [20, 30, 10]
+    assert store.current == {"10-0": {"id": "10-0"}}
+
+
+def test_entity_store_updates_entities_in_place():
+    store = EntityStore()
+    updated = []
+    store.subscribe(updated.append)
+
+    account = store.put("accounts", {"id": "FACC-1234", "name": "Test"})
+    assert store.put("accounts", {"id": "FACC-1234", "name": "Test"}) is account
+    assert updated == []
+
+    assert store.put("accounts", {"id": "FACC-1234", "name": "Updated"}) is account
+    assert account == {"id": "FACC-1234", "name": "Updated"}
+    assert updated == [account]
+    assert store.put("users/FUSR-1234/accounts", {"id": "FACC-1234"}) is account
+    assert updated == [account]
+    assert store.put("users/FUSR-1234/accounts", {"id": "FACC-1234", "name": "Nested"}) is account
+    assert account == {"id": "FACC-1234", "name": "Nested"}
+    assert updated == [account, account]
+    assert store.get("accounts", "FACC-1234") is account
+    assert store.put("users", {"id": "FACC-1234"}) is not account
+    assert store.put("accounts", {"detail": "Not found"}) == {"detail": "Not found"}
+
+    del account, updated[:]
+    gc.collect()
+    assert store.get("accounts", "FACC-1234") is None
+    assert len(store) == 0
@@ -0,0 +1,81 @@
+import time
+
+from fico.concurrency import AdaptiveConcurrency
+from fico.metrics import Metrics
+
+
+def make_controller(**kwargs) -> AdaptiveConcurrency:
+    options = {
+        "limit": 8,
+        "min_limit": 1,
+        "max_limit": 16,
+        "page_size": 100,
+        "min_page_size": 50,
+        "max_page_size": 200,
+        "window": 4,
+        **kwargs,
+    }
+    return AdaptiveConcurrency(Metrics(), **options)
+
+
+def test_burst_of_throttles_backs_off_once():
+    controller = make_controller()
+    sent_at = time.monotonic()
+    for _ in range(16):
+        controller.record_throttled(429, sent_at)
+
+    assert controller.limit == 4
+    assert controller.page_size == 50
+    assert controller.metrics.get("pagination.decreases") == 1
+    assert controller.metrics.get("pagination.throttles_ignored") == 15
+
+    controller.record_throttled(503, time.monotonic())
+    assert controller.limit == 2
+    assert controller.metrics.get("pagination.decreases") == 2
+
+
+def test_increase_concurrency_then_page_size():
+    controller = make_controller(limit=15)
+    for _ in range(4):
+        controller.record_success(0.1)
+
+    assert controller.limit == 16
+    assert controller.page_size == 100
+    assert controller.metrics.get("pagination.p95") == 0.1
+    assert controller.metrics.get("pagination.concurrency") == 16
+
+    for _ in range(4):
+        controller.record_success(0.1)
+
+    assert controller.limit == 16
+    assert controller.page_size == 150
+    assert controller.baseline_p95 is None
+    assert controller.metrics.get("pagination.page_size") == 150
+
+    for _ in range(8):
+        controller.record_success(0.1)
+
+    assert controller.page_size == 200
+    assert controller.metrics.get("pagination.increases") == 3
+    assert controller.metrics.get("pagination.last_decision").startswith("increase")
+
+
+def test_decrease_when_latency_rises():
+    controller = make_controller()
+    for _ in range(4):
+        controller.record_success(0.1)
+    assert controller.limit == 9
+
+    for _ in range(4):
+        controller.record_success(0.2)
+
+    assert controller.limit == 4
+    assert controller.page_size == 50
+    assert controller.metrics.get("pagination.decreases") == 1
+    assert controller.metrics.get("pagination.last_decision").startswith("decrease")
+
+    for _ in range(3):
+        controller.record_throttled(429, time.monotonic())
+    assert controller.limit == 1
+    assert controller.page_size == 50
+
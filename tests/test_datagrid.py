@@ -0,0 +1,375 @@
+import asyncio
+import gc
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from pytest_mock import MockerFixture
+from textual.app import App
+from textual.widgets import DataTable, Label
+
+from fico.cache import EntityStore
+from fico.ratelimit import Priority, request_priority
+from fico.utils import format_at, format_status
+from fico.widgets.datagrid import (
+    BLOCK_SIZE,
+    MAX_BLOCKS,
+    RECENT_PAGES,
+    DataGrid,
+    DataGridColumn,
+    format_rows,
+)
+
+
+def test_format_rows():
+    columns = [
+        DataGridColumn(title="ID", field="id"),
+        DataGridColumn(title="Status", field="status", formatter=format_status),
+        DataGridColumn(title="Created at", field="events.created", formatter=format_at),
+    ]
+    objects = [
+        {
+            "id": "FACC-1234",
+            "status": "active",
+            "events": {"created": {"at": "2025-01-01T10:00:00+00:00"}},
+        },
+        {"id": "FACC-5678", "status": "active", "events": None},
+        {"id": "FACC-9012", "status": "", "events": {"created": {}}},
+    ]
+
+    assert format_rows(columns, objects) == [
+        ("FACC-1234", "[bold green]active[/]", "01/01/2025 10:00:00"),
+        ("FACC-5678", "[bold green]active[/]", "-"),
+        ("FACC-9012", "-", "-"),
+    ]
+    assert format_rows(columns, objects) == [
+        tuple(column.get_field(obj) for column in columns) for obj in objects
+    ]
+
+
+ID_COLUMNS = [DataGridColumn(title="ID", field="id")]
+NAME_COLUMNS = [
+    DataGridColumn(title="ID", field="id"),
+    DataGridColumn(title="Name", field="name"),
+]
+
+
+class DataGridApp(App):
+    """Shows `count` grids over `datasource`, the other options are passed to DataGrid."""
+
+    def __init__(
+        self,
+        datasource: Callable[..., Coroutine[None, None, dict[str, Any]]],
+        columns: list[DataGridColumn] | None = None,
+        count: int = 1,
+        **options: Any,
+    ):
+        super().__init__()
+        self.datasource = datasource
+        self.columns = columns or ID_COLUMNS
+        self.count = count
+        self.options = options
+
+    def compose(self):
+        for _ in range(self.count):
+            yield DataGrid(columns=self.columns, datasource=self.datasource, **self.options)
+
+
+async def test_reload_updates_changed_rows_only(mocker: MockerFixture):
+    pages = [
+        [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}, {"id": "c", "name": "C"}],
+        [{"id": "a", "name": "A"}, {"id": "b", "name": "B2"}, {"id": "c", "name": "C"}],
+        [{"id": "a", "name": "A"}, {"id": "c", "name": "C"}, {"id": "d", "name": "D"}],
+        [{"id": "d", "name": "D"}, {"id": "c", "name": "C"}],
+    ]
+
+    async def list_objects() -> dict[str, Any]:
+        items = pages.pop(0)
+        return {"total": len(items), "items": items}
+
+    app = DataGridApp(list_objects, columns=NAME_COLUMNS, pagination=False)
+
+    async def reload() -> list[list[str]]:
+        await grid.reload().wait()
+        return [table.get_row(row.key) for row in table.ordered_rows]
+
+    async with app.run_test():
+        grid = app.query_one(DataGrid)
+        table = grid.query_one(DataTable)
+        await reload()
+        table.move_cursor(row=2)
+        clear = mocker.spy(table, "clear")
+
+        assert await reload() == [["a", "A"], ["b", "B2"], ["c", "C"]]
+        assert table.cursor_row == 2
+
+        assert await reload() == [["a", "A"], ["c", "C"], ["d", "D"]]
+        assert table.cursor_row == 1
+        assert clear.call_count == 0
+
+        assert await reload() == [["d", "D"], ["c", "C"]]
+        assert table.cursor_row == 1
+        assert clear.call_count == 1
+        assert set(grid.objects.current) == {"c", "d"}
+
+
+async def test_entity_updates_are_shown_in_place():
+    entities = EntityStore()
+    calls = []
+
+    async def list_objects() -> dict[str, Any]:
+        calls.append(1)
+        items = [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}]
+        return {"total": 2, "items": [entities.put("objects", item) for item in items]}
+
+    app = DataGridApp(
+        list_objects,
+        columns=[DataGridColumn(title="Name", field="name")],
+        count=2,
+        pagination=False,
+        entities=entities,
+    )
+    async with app.run_test() as pilot:
+        grids = list(app.query(DataGrid))
+        for grid in grids:
+            await grid.reload().wait()
+        await pilot.pause()
+
+        entities.put("objects", {"id": "b", "name": "B2"})
+        entities.put("other", {"id": "a", "name": "Other"})
+        await pilot.pause()
+
+        for grid in grids:
+            assert grid.query_one(DataTable).get_row("b") == ["B2"]
+            assert grid.query_one(DataTable).get_row("a") == ["A"]
+        assert len(calls) == 2
+
+        await grids[0].remove()
+        assert entities.subscribers == [grids[1].update_entity]
+
+
+async def test_newer_reload_cancels_the_running_one():
+    cancelled = []
+
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        try:
+            await asyncio.sleep(0.2 if offset == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(offset)
+            raise
+        return {"total": 20, "items": [{"id": f"{offset}", "name": "Page"}]}
+
+    app = DataGridApp(list_objects)
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        first = grid.reload()
+        await asyncio.sleep(0.05)
+        grid.current_offset = 10
+        await grid.reload().wait()
+        await pilot.pause()
+
+        assert first.is_cancelled
+        assert cancelled == [0]
+        assert [row.key.value for row in grid.query_one(DataTable).ordered_rows] == ["10"]
+
+
+async def test_reloads_in_the_same_frame_are_merged(mocker: MockerFixture):
+    calls = []
+
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        calls.append((limit, offset, rql))
+        return {"total": 1, "items": [{"id": "a", "name": "A"}]}
+
+    app = DataGridApp(list_objects, name="objects")
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        reload = mocker.spy(grid, "reload")
+        grid.reset()
+        grid.reset("eq(status,active)")
+        grid.schedule_reload()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert calls == [(10, 0, "eq(status,active)")]
+        reload.assert_called_once_with(cached=False)
+        assert grid.metrics.get("datagrid.objects.reload_requests") == 3
+        assert grid.metrics.get("datagrid.objects.fetches") == 1
+        assert grid.query_one(DataTable).row_count == 1
+
+
+async def test_prefetch_adjacent_pages():
+    calls = []
+
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        calls.append((offset, request_priority.get()))
+        return {"total": 30, "items": [{"id": f"{offset}", "name": "Page"}]}
+
+    app = DataGridApp(list_objects)
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        await grid.reload().wait()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        assert calls == [(0, Priority.INTERACTIVE), (10, Priority.BACKGROUND)]
+
+        calls.clear()
+        grid.current_offset = 10
+        await grid.reload(cached=True).wait()
+        await app.workers.wait_for_complete()
+        assert [row.key.value for row in grid.query_one(DataTable).ordered_rows] == ["10"]
+        assert calls == [(20, Priority.BACKGROUND)]
+
+        calls.clear()
+        grid.current_offset = 0
+        await grid.reload().wait()
+        assert calls[0] == (0, Priority.INTERACTIVE)
+
+
+async def test_reset_discards_pages_being_prefetched():
+    version = 0
+    release = asyncio.Event()
+
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        snapshot = version
+        if request_priority.get() == Priority.BACKGROUND:
+            await release.wait()
+        return {"total": 30, "items": [{"id": f"{offset}", "name": f"v{snapshot}"}]}
+
+    app = DataGridApp(list_objects)
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        await grid.reload().wait()
+        await pilot.pause()
+
+        # An object is created while the next page is being prefetched.
+        version = 1
+        grid.reset()
+        release.set()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+
+        assert grid.pages.get((None, 10, 10))["items"] == [{"id": "10", "name": "v1"}]
+
+
+async def test_virtual_scroll_keeps_a_window_of_blocks():
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        items = [{"id": f"{i}", "name": "Row"} for i in range(offset, min(offset + limit, 1000))]
+        return {"total": 1000, "items": items}
+
+    async def move_cursor(row: int) -> str:
+        table.move_cursor(row=row)
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        return table.ordered_rows[table.cursor_row].key.value
+
+    app = DataGridApp(list_objects, virtual=True)
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        table = grid.query_one(DataTable)
+        await grid.reload().wait()
+        assert table.row_count == BLOCK_SIZE
+
+        assert await move_cursor(90) == "90"
+        assert await move_cursor(190) == "190"
+        assert sorted(grid.blocks) == [0, 100, 200]
+
+        assert await move_cursor(290) == "290"
+        assert sorted(grid.blocks) == [100, 200, 300]
+        assert table.row_count == MAX_BLOCKS * BLOCK_SIZE
+        assert len(grid.objects) == MAX_BLOCKS * BLOCK_SIZE
+
+        assert await move_cursor(5) == "105"
+        assert sorted(grid.blocks) == [0, 100, 200]
+
+
+async def test_virtual_scroll_position_skips_duplicate_rows():
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        # Two rows are inserted at the top once the first block has been fetched.
+        start = offset - 2 if offset else 0
+        items = [{"id": f"{i}", "name": "Row"} for i in range(start, start + limit)]
+        return {"total": 1000, "items": items}
+
+    app = DataGridApp(list_objects, virtual=True)
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        table = grid.query_one(DataTable)
+        await grid.reload().wait()
+        table.move_cursor(row=90)
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert table.row_count == 2 * BLOCK_SIZE - 2
+
+        table.move_cursor(row=100)
+        await pilot.pause()
+        label = grid.query_one("#position", Label)
+        assert table.ordered_rows[100].key.value == "100"
+        assert str(label.render()) == "103 of 1000 rows"
+
+
+async def test_virtual_reset_discards_blocks_being_loaded():
+    calls = []
+    release = asyncio.Event()
+
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        calls.append((offset, rql))
+        if offset:
+            await release.wait()
+        items = [{"id": f"{rql}-{i}", "name": "Row"} for i in range(offset, offset + limit)]
+        return {"total": 1000, "items": items}
+
+    app = DataGridApp(list_objects, virtual=True)
+    async with app.run_test() as pilot:
+        grid = app.query_one(DataGrid)
+        table = grid.query_one(DataTable)
+        await grid.reload().wait()
+        table.move_cursor(row=90)
+        await pilot.pause()
+        assert calls[-1] == (100, None)
+
+        calls.clear()
+        grid.reset("eq(name,Row)")
+        release.set()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert calls == [(0, "eq(name,Row)")]
+        assert sorted(grid.blocks) == [0]
+        assert table.ordered_rows[0].key.value == "eq(name,Row)-0"
+
+
+async def test_paging_memory_stays_flat():
+    async def list_objects(limit: int, offset: int, rql: str | None) -> dict[str, Any]:
+        items = [
+            {"id": f"FACC-{i:06}", "name": f"Affiliate {i}", "description": "x" * 200}
+            for i in range(offset, offset + limit)
+        ]
+        return {"total": 100 * limit, "items": items}
+
+    app = DataGridApp(list_objects, columns=NAME_COLUMNS, name="accounts")
+    async with app.run_test():
+        grid = app.query_one(DataGrid)
+        grid.current_limit = 100
+        sizes = []
+        tracemalloc.start()
+        try:
+            for page in range(100):
+                grid.current_offset = page * grid.current_limit
+                await grid.reload(cached=True).wait()
+                await app.workers.wait_for_complete()
+                if page in (50, 99):
+                    gc.collect()
+                    # Only the synthetic objects allocated by the datasource above.
+                    snapshot = tracemalloc.take_snapshot().filter_traces(
+                        [tracemalloc.Filter(True, __file__)]
+                    )
+                    sizes.append(sum(stat.size for stat in snapshot.statistics("filename")))
+        finally:
+            tracemalloc.stop()
+
+        assert len(grid.objects) == (RECENT_PAGES + 1) * 100
+        assert grid.metrics.get("datagrid.accounts.objects") == len(grid.objects)
+        assert sizes[1] <= sizes[0] * 1.1
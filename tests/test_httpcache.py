@@ -0,0 +1,94 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+from pytest_mock import MockerFixture
+
+from fico.httpcache import CachingTransport
+
+
+class Server:
+    def __init__(self) -> None:
+        self.version = "v1"
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = f'"{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            headers={"ETag": etag},
+            json={"path": request.url.path, "version": self.version},
+        )
+
+
+def build_client(
+    tmp_path: Path, server: Server, account: str = "FACC-1234", max_size: int = 1024
+) -> httpx.AsyncClient:
+    transport = CachingTransport(
+        tmp_path,
+        scope=lambda: account,
+        max_size=max_size,
+        transport=httpx.MockTransport(server),
+    )
+    return httpx.AsyncClient(base_url="https://localhost/ops/v1", transport=transport)
+
+
+async def test_revalidate_cached_response(tmp_path: Path):
+    server = Server()
+    client = build_client(tmp_path, server)
+
+    first = await client.get("/accounts")
+    second = await client.get("/accounts")
+
+    assert first.json() == second.json() == {"path": "/ops/v1/accounts", "version": "v1"}
+    assert second.extensions["from_cache"]
+    assert "If-None-Match" not in server.requests[0].headers
+    assert server.requests[1].headers["If-None-Match"] == '"v1"'
+
+    server.version = "v2"
+    third = await client.get("/accounts")
+    assert third.json()["version"] == "v2"
+
+
+async def test_cache_scoped_by_account(tmp_path: Path):
+    server = Server()
+    await build_client(tmp_path, server, account="FACC-1234").get("/accounts")
+    await build_client(tmp_path, server, account="FACC-5678").get("/accounts")
+
+    assert "If-None-Match" not in server.requests[1].headers
+
+
+async def test_cache_evicts_least_recently_used(tmp_path: Path):
+    server = Server()
+    client = build_client(tmp_path, server, max_size=100)
+
+    for path in ("/accounts", "/organizations", "/users"):
+        await client.get(path)
+        await asyncio.sleep(0.01)
+
+    assert len(list(tmp_path.glob("*.body"))) == 2
+    await client.get("/accounts")
+    assert "If-None-Match" not in server.requests[-1].headers
+
+
+async def test_cache_scans_directory_only_to_evict(tmp_path: Path, mocker: MockerFixture):
+    server = Server()
+    client = build_client(tmp_path, server, max_size=80)
+    transport: CachingTransport = client._transport  # type: ignore
+    scan = mocker.spy(transport, "scan")
+
+    await client.get("/accounts")
+    await client.get("/accounts")
+    assert scan.call_count == 1
+
+    server.version = "v2"
+    await client.get("/accounts")
+    assert scan.call_count == 1
+    assert transport.size == len(b'{"path":"/ops/v1/accounts","version":"v2"}')
+
+    await client.get("/organizations")
+    assert scan.call_count == 2
+    assert len(list(tmp_path.glob("*.body"))) == 1
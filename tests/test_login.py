@@ -5,6 +5,8 @@ from pytest_mock import MockerFixture
 
 from fico.api import FFCOpsClient
 from fico.app import Fico
+from fico.screens.login import LoginDialog
+from fico.screens.main import MainScreen
 from tests.types import ConfigMocker, ListsMocker, SnapCompare
 
 
@@ -71,3 +73,34 @@ async def test_login_cancel(
         await pilot.click("#cancel")
 
     mocked_login.assert_not_awaited()
+
+
+async def test_startup_with_invalid_credentials(
+    config_mocker: ConfigMocker,
+    default_config: dict[str, Any],
+    httpx_mock: HTTPXMock,
+    mock_lists: ListsMocker,
+):
+    config_mocker({**default_config, "url": "https://localhost/ops/v1"})
+    httpx_mock.add_response(
+        method="GET",
+        url="https://localhost/ops/v1/users/FUSR-1234",
+        status_code=401,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://localhost/ops/v1/auth/tokens",
+        status_code=401,
+        is_optional=True,
+    )
+    mock_lists()
+
+    app = Fico()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert isinstance(app.screen, LoginDialog)
+        assert not any(isinstance(screen, MainScreen) for screen in app.screen_stack)
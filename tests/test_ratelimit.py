@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from fico.ratelimit import Priority, TokenBucket, request_priority
+
+
+async def test_token_bucket_rate():
+    bucket = TokenBucket(rate=100, burst=1)
+    started_at = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(21)))
+    assert time.monotonic() - started_at >= 0.19
+
+
+async def test_token_bucket_serves_interactive_first():
+    bucket = TokenBucket(rate=50, burst=1)
+    await bucket.acquire()
+    served = []
+
+    async def acquire(name: str, priority: Priority):
+        request_priority.set(priority)
+        await bucket.acquire()
+        served.append(name)
+
+    await asyncio.gather(
+        acquire("background", Priority.BACKGROUND),
+        acquire("bulk", Priority.BULK),
+        acquire("interactive", Priority.INTERACTIVE),
+    )
+    assert served == ["interactive", "bulk", "background"]
+    assert bucket.metrics.get("ratelimit.waits.bulk") == 1
+
+
+async def test_token_bucket_cancelled_waiter():
+    bucket = TokenBucket(rate=20, burst=1)
+    await bucket.acquire()
+    waiter = asyncio.create_task(bucket.acquire(Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.wait_for(bucket.acquire(Priority.BULK), timeout=1)
+
+
+async def test_token_bucket_escalate():
+    bucket = TokenBucket(rate=50, burst=1)
+    await bucket.acquire()
+    served = []
+
+    async def acquire(name: str):
+        request_priority.set(Priority.BACKGROUND)
+        await bucket.acquire()
+        served.append(name)
+
+    waiting = asyncio.create_task(acquire("waiting"))
+    others = [asyncio.create_task(acquire(f"other {i}")) for i in range(2)]
+    starting = asyncio.create_task(acquire("starting"))
+    bucket.escalate(starting, Priority.INTERACTIVE)
+    await asyncio.sleep(0)
+    bucket.escalate(waiting, Priority.BULK)
+
+    await asyncio.gather(waiting, starting, *others)
+    assert served == ["starting", "waiting", "other 0", "other 1"]
+    assert bucket.metrics.get("ratelimit.escalations") == 1
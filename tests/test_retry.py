@@ -0,0 +1,49 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from fico.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("5", 5.0),
+        ("-1", 0.0),
+        ("not a date", None),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    value = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(value) <= 30  # type: ignore
+
+
+def test_retry_policy_honours_retry_after():
+    policy = RetryPolicy(max_delay=10)
+    response = httpx.Response(429, headers={"Retry-After": "3"})
+    assert policy.get_delay(0, response) == 3
+    response = httpx.Response(429, headers={"Retry-After": "60"})
+    assert policy.get_delay(0, response) == 10
+
+
+def test_retry_policy_exponential_backoff():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    for attempt, ceiling in ((0, 1), (1, 2), (2, 4), (3, 5), (10, 5)):
+        assert 0 <= policy.get_delay(attempt) <= ceiling
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
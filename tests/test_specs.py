@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import httpx
+from pytest_httpx import HTTPXMock
+
+from fico.specs import APISpecs, build_index
+
+SPEC = {
+    "paths": {
+        "/accounts": {
+            "get": {
+                "description": "accounts rql help",
+                "parameters": [
+                    {"name": "limit", "in": "query"},
+                    {"name": "offset", "in": "query"},
+                    {"name": "name", "in": "query"},
+                ],
+            },
+            "post": {},
+        },
+        "/accounts/{id}": {"get": {}, "put": {}},
+        "/accounts/{id}/disable": {"post": {}},
+        "/accounts/{id}/enable": {"post": {}},
+        "/users/{id}/accounts": {"get": {"description": "user accounts"}},
+    }
+}
+
+
+def test_build_index():
+    assert build_index(SPEC) == {
+        "accounts": {
+            "rql_help": "accounts rql help",
+            "filters": ["name"],
+            "actions": [
+                {"method": "POST", "name": "disable"},
+                {"method": "POST", "name": "enable"},
+            ],
+        },
+        "users": {"rql_help": None, "filters": [], "actions": []},
+    }
+
+
+def test_save_and_load(tmp_path: Path):
+    specs = APISpecs(tmp_path / "specs" / "index.json")
+    specs.etag = '"v1"'
+    specs.collections = build_index(SPEC)
+    specs.save()
+
+    loaded = APISpecs(tmp_path / "specs" / "index.json")
+
+    assert loaded.load()
+    assert loaded.etag == '"v1"'
+    assert loaded.get_rql_help("accounts") == "accounts rql help"
+    assert loaded.get_filters("accounts") == ["name"]
+    assert loaded.get_actions("users") == []
+    assert not APISpecs(tmp_path / "missing.json").load()
+
+    (tmp_path / "malformed.json").write_text('{"etag": "v1"}')
+    assert not APISpecs(tmp_path / "malformed.json").load()
+
+
+async def test_fetch_revalidates_saved_index(tmp_path: Path, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.example.com/ops/v1/openapi.json",
+        json=SPEC,
+        headers={"ETag": '"v1"'},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.example.com/ops/v1/openapi.json",
+        status_code=304,
+        match_headers={"If-None-Match": '"v1"'},
+    )
+
+    async with httpx.AsyncClient(base_url="https://api.example.com/ops/v1") as client:
+        specs = APISpecs(tmp_path / "index.json")
+        await specs.fetch(client)
+
+        cached = APISpecs(tmp_path / "index.json")
+        assert cached.load()
+        await cached.fetch(client)
+
+    assert cached.get_rql_help("accounts") == "accounts rql help"
+    assert len(httpx_mock.get_requests()) == 2
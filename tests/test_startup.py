@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+LAZY_MODULES = ("pycountry", "tree_sitter_rql", "markdown_it")
+
+
+def test_heavy_modules_are_not_imported_on_startup():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, fico.app; print(*(m for m in {LAZY_MODULES} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,16 @@
+from fico.constants import get_currencies
+from fico.utils import format_currency, get_currency_labels
+
+
+def test_format_currency():
+    assert format_currency("EUR") == "EUR - Euro"
+    assert format_currency("ZZZ") == "ZZZ"
+
+
+def test_currencies_share_the_labels():
+    labels = get_currency_labels()
+
+    assert get_currency_labels() is labels
+    assert ("USD - US Dollar", "USD") in get_currencies()
+    assert all(labels[code] == label for label, code in get_currencies())
+    assert "XXX" not in dict(get_currencies()).values()
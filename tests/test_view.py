@@ -0,0 +1,43 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from textual.app import App
+from textual.widgets import Select
+
+from fico.widgets.view import View
+
+
+class PagesClient:
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def iter_all_pages(
+        self, collection: str, rql: str | None = None
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        yield [{"id": "FACC-0001", "name": "First"}]
+        await self.release.wait()
+        yield [{"id": "FACC-0002", "name": "Second"}]
+
+
+class SelectApp(App):
+    def compose(self):
+        yield Select([])
+
+
+async def test_load_select_options_page_by_page():
+    client = PagesClient()
+    view = View(client)  # type: ignore
+
+    app = SelectApp()
+    async with app.run_test() as pilot:
+        select = app.query_one(Select)
+        loading = asyncio.create_task(view.load_select_options(select, "accounts", "rql"))
+        await pilot.pause()
+
+        select.value = "FACC-0001"
+        client.release.set()
+        await loading
+
+        assert select.value == "FACC-0001"
+        select.value = "FACC-0002"